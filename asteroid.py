@@ -1,18 +1,27 @@
-import pygame
-import random
 from constants import *
 from circleshape import CircleShape
+from spritecache import sprite_cache
+from goldorb import GoldOrb
 
 
 class Asteroid(CircleShape):
+    offscreen_margin = ASTEROID_OFFSCREEN_MARGIN
+    max_count = ASTEROID_MAX_COUNT
+
     def __init__(self, x, y, radius):
         super().__init__(x, y, radius)
 
+    def sprite_image(self):
+        return sprite_cache.asteroid(self.radius)
+
     def draw(self, screen):
-        pygame.draw.circle(screen, (255, 255, 255), self.position, self.radius)
+        self.blit_image(screen)
 
     def update(self, dt):
+        if self.slot is not None:
+            return  # moved and culled in bulk by the entity store
         self.position += self.velocity * dt
+        self.update_lifetime(dt)
 
     def split(self):
         """Split the asteroid and return gold orbs if it's a small asteroid"""
@@ -20,7 +29,6 @@ class Asteroid(CircleShape):
         
         # If this is a small asteroid (minimum size), drop a gold orb
         if self.radius <= ASTEROID_MIN_RADIUS:
-            from goldorb import GoldOrb
             orb = GoldOrb(self.position.x, self.position.y)
             orbs_to_spawn.append(orb)
             self.kill()
@@ -29,7 +37,7 @@ class Asteroid(CircleShape):
         self.kill()
 
         # randomize the angle of the split
-        random_angle = random.uniform(20, 50)
+        random_angle = self.rng.uniform(20, 50)
 
         a = self.velocity.rotate(random_angle)
         b = self.velocity.rotate(-random_angle)
@@ -42,26 +50,14 @@ class Asteroid(CircleShape):
         
         return orbs_to_spawn
 
-    def destroy_for_orbs(self):
-        """Destroy asteroid and return orbs based on size (for star effect)"""
-        orbs_to_spawn = []
-        from goldorb import GoldOrb
-        
-        # Calculate how many orbs based on asteroid size
-        if self.radius <= ASTEROID_MIN_RADIUS:
-            # Small asteroid = 1 orb
-            orb_count = 1
-        elif self.radius <= ASTEROID_MIN_RADIUS * 2:
-            # Medium asteroid = 3 orbs
-            orb_count = 3
-        else:
-            # Large asteroid = 7 orbs
-            orb_count = 7
-        
-        # Create the orbs
-        for _ in range(orb_count):
-            orb = GoldOrb(self.position.x, self.position.y)
-            orbs_to_spawn.append(orb)
-        
-        self.kill()
-        return orbs_to_spawn
\ No newline at end of file
+
+def orb_count_for(radius):
+    """How many orbs an asteroid of this radius drops when vaporized"""
+    if radius <= ASTEROID_MIN_RADIUS:
+        # Small asteroid = 1 orb
+        return 1
+    elif radius <= ASTEROID_MIN_RADIUS * 2:
+        # Medium asteroid = 3 orbs
+        return 3
+    # Large asteroid = 7 orbs
+    return 7
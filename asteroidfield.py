@@ -4,7 +4,12 @@ from asteroid import Asteroid
 from constants import *
 
 
-class AsteroidField(pygame.sprite.Sprite):
+class AsteroidField:
+    """Spawns asteroids at the screen edges on a repeating scheduler timer"""
+
+    rng = random  # replaced by a seeded per-game RNG in init_game
+    scheduler = None  # the world's game-time Scheduler, set in init_game
+
     edges = [
         [
             pygame.Vector2(1, 0),
@@ -29,23 +34,26 @@ class AsteroidField(pygame.sprite.Sprite):
     ]
 
     def __init__(self):
-        pygame.sprite.Sprite.__init__(self, self.containers)
-        self.spawn_timer = 0.0
+        self.spawn_timer = self.scheduler.call_every(ASTEROID_SPAWN_RATE, self.spawn_random)
+
+    @property
+    def spawn_rate(self):
+        return self.spawn_timer.interval
+
+    def set_spawn_rate(self, seconds):
+        """Change the seconds between spawns, counted from the last spawn"""
+        self.spawn_timer = self.scheduler.set_interval(self.spawn_timer, seconds)
 
     def spawn(self, radius, position, velocity):
         asteroid = Asteroid(position.x, position.y, radius)
         asteroid.velocity = velocity
 
-    def update(self, dt):
-        self.spawn_timer += dt
-        if self.spawn_timer > ASTEROID_SPAWN_RATE:
-            self.spawn_timer = 0
-
-            # spawn a new asteroid at a random edge
-            edge = random.choice(self.edges)
-            speed = random.randint(40, 100)
-            velocity = edge[0] * speed
-            velocity = velocity.rotate(random.randint(-30, 30))
-            position = edge[1](random.uniform(0, 1))
-            kind = random.randint(1, ASTEROID_KINDS)
-            self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
\ No newline at end of file
+    def spawn_random(self):
+        """Spawn a new asteroid at a random edge"""
+        edge = self.rng.choice(self.edges)
+        speed = self.rng.randint(40, 100)
+        velocity = edge[0] * speed
+        velocity = velocity.rotate(self.rng.randint(-30, 30))
+        position = edge[1](self.rng.uniform(0, 1))
+        kind = self.rng.randint(1, ASTEROID_KINDS)
+        self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from constants import *
+from gameworld import GameWorld
+from headless import random_policy
+from benchmarks.stats import percentile
+
+# Entity groups whose peak sizes are reported for each game
+PEAK_GROUPS = ('asteroids', 'shots', 'orbs', 'meteorites', 'stars')
+
+
+def play_game(seed, frames=10000, dt=SIMULATION_TIMESTEP, use_entity_store=False, stop_on_game_over=True):
+    """Play one headless game with the random policy, returning score, survival, peaks and frame costs"""
+    policy = random_policy(random.Random(seed))
+    world = GameWorld(seed, use_entity_store)
+    peaks = dict.fromkeys(PEAK_GROUPS, 0)
+    groups = [(name, getattr(world, name)) for name in PEAK_GROUPS]
+    costs = []
+    clock = time.perf_counter
+    for frame in range(frames):
+        start = clock()
+        world.step(policy(world, frame), dt)
+        costs.append(clock() - start)
+        for name, group in groups:
+            size = len(group)
+            if size > peaks[name]:
+                peaks[name] = size
+        if world.game_over and stop_on_game_over:
+            break
+
+    return {
+        'seed': seed,
+        'frames': world.frame,
+        'score': world.player.points,
+        'survival_time': world.frame * dt,
+        'game_over': world.game_over,
+        'peaks': peaks,
+        'frame_ms': {
+            'mean': sum(costs) / len(costs) * 1000 if costs else 0.0,
+            'p50': percentile(costs, 0.50) * 1000 if costs else 0.0,
+            'p95': percentile(costs, 0.95) * 1000 if costs else 0.0,
+            'max': max(costs, default=0.0) * 1000,
+        },
+    }
+
+def play_games(seeds, frames, dt, use_entity_store, stop_on_game_over):
+    """Play a chunk of games in one worker, so each task costs more than its pickling"""
+    return [play_game(seed, frames, dt, use_entity_store, stop_on_game_over) for seed in seeds]
+
+def run_batch(seeds, frames=10000, dt=SIMULATION_TIMESTEP, use_entity_store=False, stop_on_game_over=True,
+              workers=None, chunk_size=None):
+    """Play one game per seed across a process pool and return the per-game results in seed order
+
+    Every game is independent (the world keeps its state in per-process class
+    attributes), so games are split into chunks and run in separate processes.
+    """
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return play_games(seeds, frames, dt, use_entity_store, stop_on_game_over)
+    if chunk_size is None:
+        # A few chunks per worker keeps every core busy even when game lengths vary
+        chunk_size = max(1, len(seeds) // (workers * 4))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_games, chunk, frames, dt, use_entity_store, stop_on_game_over)
+                   for chunk in chunks]
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+def summarize(results):
+    """Aggregate per-game results into batch statistics"""
+    if not results:
+        return {'games': 0}
+    scores = [result['score'] for result in results]
+    survival = [result['survival_time'] for result in results]
+    return {
+        'games': len(results),
+        'game_overs': sum(result['game_over'] for result in results),
+        'frames': sum(result['frames'] for result in results),
+        'score': {
+            'mean': sum(scores) / len(scores),
+            'min': min(scores),
+            'p50': percentile(scores, 0.50),
+            'p95': percentile(scores, 0.95),
+            'max': max(scores),
+        },
+        'survival_time': {
+            'mean': sum(survival) / len(survival),
+            'min': min(survival),
+            'p50': percentile(survival, 0.50),
+            'max': max(survival),
+        },
+        'peaks': {name: max(result['peaks'][name] for result in results) for name in PEAK_GROUPS},
+        'frame_ms': {
+            'mean': sum(result['frame_ms']['mean'] * result['frames'] for result in results)
+                    / max(1, sum(result['frames'] for result in results)),
+            'p95': percentile([result['frame_ms']['p95'] for result in results], 0.95),
+            'max': max(result['frame_ms']['max'] for result in results),
+        },
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many headless games in parallel and aggregate the results")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--first-seed", type=int, default=0, help="games use consecutive seeds from here")
+    parser.add_argument("--frames", type=int, default=10000, help="frame limit per game")
+    parser.add_argument("--dt", type=float, default=SIMULATION_TIMESTEP)
+    parser.add_argument("--workers", type=int, default=None, help="processes to use (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="games per task sent to a worker")
+    parser.add_argument("--keep-going", action="store_true", help="keep stepping after game over")
+    parser.add_argument("--entity-store", action="store_true", help="move entities with the NumPy entity store")
+    parser.add_argument("--output", help="write the summary and per-game results as JSON")
+    args = parser.parse_args()
+
+    seeds = range(args.first_seed, args.first_seed + args.games)
+    start = time.perf_counter()
+    results = run_batch(seeds, args.frames, args.dt, args.entity_store, not args.keep_going,
+                        args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    summary['elapsed'] = elapsed
+    summary['games_per_second'] = len(results) / elapsed if elapsed > 0 else 0.0
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'summary': summary, 'games': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Scripted performance scenarios for the game's hot paths.
+
+Run from the repository root with ``python -m benchmarks``, and
+``python -m benchmarks.startup`` for import and time-to-first-frame costs.
+"""
@@ -0,0 +1,64 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.stats import percentile, compare
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+
+def summarize(name, n, times):
+    total = sum(times)
+    return {
+        'scenario': name,
+        'entities': n,
+        'frames': len(times),
+        'p50_ms': percentile(times, 0.50) * 1000,
+        'p95_ms': percentile(times, 0.95) * 1000,
+        'p99_ms': percentile(times, 0.99) * 1000,
+        'objects_per_second': n * len(times) / total if total > 0 else 0.0,
+    }
+
+def frames_for(n, budget):
+    """Fewer frames for bigger worlds so each point costs roughly the same"""
+    return max(3, min(200, budget // max(n, 1)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the game's hot paths across entity counts")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--budget", type=int, default=200000, help="entity-frames per data point")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON from an earlier run to compare p95 against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.scenarios:
+        for n in args.sizes:
+            times = SCENARIOS[name](n, frames_for(n, args.budget))
+            result = summarize(name, n, times)
+            results.append(result)
+            print(f"{name:>12} n={n:<7} p50 {result['p50_ms']:9.3f} ms  p95 {result['p95_ms']:9.3f} ms  "
+                  f"p99 {result['p99_ms']:9.3f} ms  {result['objects_per_second']:12.0f} obj/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'timestamp': time.time(),
+                'python': sys.version,
+                'platform': platform.platform(),
+                'results': results,
+            }, f, indent=2)
+
+    # p95 tracks the long frames that show up as stutter
+    if args.compare and compare(results, args.compare, args.threshold, key=lambda r: (r['scenario'], r['entities']),
+                                field='p95_ms', label=lambda r: f"{r['scenario']:>12} n={r['entities']:<7}"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
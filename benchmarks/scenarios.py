@@ -0,0 +1,151 @@
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+
+import pygame
+
+from constants import *
+from asteroid import Asteroid
+from shot import Shot
+from goldorb import GoldOrb
+from star import Star
+from gameworld import GameWorld
+from highscore import HighScore
+from scorestore import ScoreStore
+from spritecache import draw_sprites
+from textcache import TextRenderer
+from starblast import StarBlast
+
+
+@contextmanager
+def uncapped(*classes):
+    """Temporarily lift max_count so scenarios can hold any number of shapes"""
+    saved = [(cls, cls.max_count) for cls in classes]
+    for cls in classes:
+        cls.max_count = None
+    try:
+        yield
+    finally:
+        for cls, max_count in saved:
+            cls.max_count = max_count
+
+def build_world(asteroids=0, shots=0, orbs=0, stars=0, seed=0, use_entity_store=False):
+    """Build a GameWorld (through init_game) populated with on-screen entities"""
+    world = GameWorld(seed, use_entity_store)
+    # Keep the player clear of the field so the scenario doesn't end itself
+    world.player.position = pygame.Vector2(-10000, -10000)
+    rng = random.Random(seed)
+
+    def place(shape, speed):
+        shape.velocity = pygame.Vector2(rng.uniform(-speed, speed), rng.uniform(-speed, speed))
+
+    with uncapped(Asteroid, Shot):
+        for _ in range(asteroids):
+            kind = rng.randint(1, ASTEROID_KINDS)
+            place(Asteroid(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+                           ASTEROID_MIN_RADIUS * kind), 5)
+        for _ in range(shots):
+            place(Shot(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)), 5)
+    for _ in range(orbs):
+        GoldOrb(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+    for _ in range(stars):
+        Star(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+    return world
+
+def time_frames(frames, setup, frame):
+    """Call frame(state) frames times after state = setup(), returning per-frame seconds"""
+    state = setup()
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        frame(state)
+        times.append(time.perf_counter() - start)
+    return times
+
+def mixed_world(n, use_entity_store=False):
+    """A world with n entities split across asteroids, shots, orbs and stars"""
+    return build_world(asteroids=n // 4, shots=n // 4, orbs=n // 4, stars=n - 3 * (n // 4),
+                       use_entity_store=use_entity_store)
+
+
+def bench_update(n, frames):
+    def frame(world):
+        world.updatable.update(SIMULATION_TIMESTEP)
+    return time_frames(frames, lambda: mixed_world(n), frame)
+
+def bench_update_store(n, frames):
+    def frame(world):
+        world.step_stores(SIMULATION_TIMESTEP)
+        world.updatable.update(SIMULATION_TIMESTEP)
+    return time_frames(frames, lambda: mixed_world(n, use_entity_store=True), frame)
+
+def bench_collisions(n, frames):
+    # Shots are spent as they hit, so the field is rebuilt outside the timed region.
+    # The caps stay lifted while timing, or the split asteroids would evict most of the field
+    times = []
+    with uncapped(Asteroid, Shot):
+        for _ in range(frames):
+            world = build_world(asteroids=n // 2, shots=n // 2)
+            start = time.perf_counter()
+            world.resolve_collisions(SIMULATION_TIMESTEP)
+            times.append(time.perf_counter() - start)
+    return times
+
+def bench_star_blast(n, frames):
+    times = []
+    for _ in range(frames):
+        world = build_world(asteroids=n)
+        start = time.perf_counter()
+        StarBlast(world.player, world.asteroids, world.orb_states).advance(None)
+        times.append(time.perf_counter() - start)
+    return times
+
+def bench_draw(n, frames):
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def frame(world):
+        surface.fill((0, 0, 0))
+        draw_sprites(surface, world.drawable)
+    return time_frames(frames, lambda: mixed_world(n), frame)
+
+def bench_high_scores(n, frames):
+    with tempfile.TemporaryDirectory() as directory:
+        store = ScoreStore(os.path.join(directory, "bench.db"), legacy_path=None)
+        store.add_many((f"player{i}", i, 0.0) for i in range(n))
+        try:
+            def setup():
+                return HighScore(store)
+
+            def frame(manager):
+                manager.add_score("bench", n // 2)
+                manager.load_scores()
+                store.rank(n // 2)
+                store.best("bench")
+            return time_frames(frames, setup, frame)
+        finally:
+            store.close()
+
+def bench_text(n, frames):
+    renderer = TextRenderer()
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def frame(counter):
+        # n distinct score strings cycled, as the HUD does while the score climbs
+        for i in range(n):
+            renderer.draw(surface, f"Score: {(counter[0] + i) % n * 100}", 36, (255, 255, 255),
+                          center=(100, 30))
+        counter[0] += 1
+    return time_frames(frames, lambda: [0], frame)
+
+
+SCENARIOS = {
+    'update': bench_update,
+    'update_store': bench_update_store,
+    'collisions': bench_collisions,
+    'star_blast': bench_star_blast,
+    'draw': bench_draw,
+    'high_scores': bench_high_scores,
+    'text': bench_text,
+}
@@ -0,0 +1,121 @@
+"""Cold-start timings: module import cost and time to the first frame.
+
+Every run starts a fresh interpreter. Run from the repository root with
+``python -m benchmarks.startup``.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.stats import percentile, compare
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def headless_env(display=False):
+    env = dict(os.environ)
+    if not display:
+        env.setdefault('SDL_VIDEODRIVER', 'dummy')
+        env.setdefault('SDL_AUDIODRIVER', 'dummy')
+    return env
+
+def import_times(module='main', display=False):
+    """Import module in a fresh interpreter under -X importtime
+
+    Returns the module's own cumulative import time and the cumulative time of
+    each module it imported directly, all in ms.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=ROOT,
+                            env=headless_env(display), capture_output=True, text=True, check=True)
+    children = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2  # one space, then two per nesting level
+        name = name.strip()
+        if depth == 1:
+            children[name] = int(cumulative) / 1000
+        elif name == module:
+            return int(cumulative) / 1000, children
+        elif depth == 0:
+            # Children are listed before their parent, so the next top-level import starts afresh
+            children = {}
+    raise RuntimeError(f"-X importtime did not report {module}")
+
+def first_frame(display=False):
+    """Launch the game until its first frame is drawn, returning (first frame ms, process ms)"""
+    with tempfile.TemporaryDirectory() as scratch:
+        dump = os.path.join(scratch, 'profile.json')
+        command = [sys.executable, os.path.join(ROOT, 'main.py'), '--startup-only', '--profile-dump', dump,
+                   '--log-file', os.path.join(scratch, 'asteroids.log')]
+        start = time.perf_counter()
+        # Run in the scratch directory so the high score database stays out of the tree
+        subprocess.run(command, cwd=scratch, env=headless_env(display), capture_output=True, check=True)
+        process_ms = (time.perf_counter() - start) * 1000
+        with open(dump) as f:
+            return json.load(f)['first_frame_ms'], process_ms
+
+def summarize(metric, values):
+    return {
+        'metric': metric,
+        'runs': len(values),
+        'p50_ms': percentile(values, 0.50),
+        'p95_ms': percentile(values, 0.95),
+        'min_ms': min(values),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the game's imports and its time to first frame")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports of main to list")
+    parser.add_argument("--display", action="store_true", help="use the real display instead of SDL's dummy driver")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON from an earlier run to compare p50 against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p50 slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    imports, first_frames, processes = [], [], []
+    modules = {}
+    for _ in range(args.runs):
+        total, children = import_times(display=args.display)
+        imports.append(total)
+        for name, ms in children.items():
+            modules.setdefault(name, []).append(ms)
+        frame_ms, process_ms = first_frame(args.display)
+        first_frames.append(frame_ms)
+        processes.append(process_ms)
+
+    results = [summarize('import_main', imports), summarize('first_frame', first_frames),
+               summarize('process', processes)]
+    for result in results:
+        print(f"{result['metric']:>14} p50 {result['p50_ms']:9.1f} ms  p95 {result['p95_ms']:9.1f} ms  "
+              f"min {result['min_ms']:9.1f} ms")
+    slowest = sorted(((percentile(times, 0.50), name) for name, times in modules.items()), reverse=True)
+    print("slowest imports of main (p50 cumulative):")
+    for ms, name in slowest[:args.top]:
+        print(f"  {name:<24} {ms:8.2f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'timestamp': time.time(),
+                'python': sys.version,
+                'platform': platform.platform(),
+                'results': results,
+                'imports_ms': {name: percentile(times, 0.50) for name, times in modules.items()},
+            }, f, indent=2)
+
+    # Startup times are noisy at the tail, so the median is what is tracked
+    if args.compare and compare(results, args.compare, args.threshold, key=lambda r: r['metric'],
+                                field='p50_ms', label=lambda r: f"{r['metric']:>14}"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Summary statistics and baseline comparison shared by the benchmark scripts."""
+import json
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of values, fraction in [0, 1]"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def compare(results, baseline_path, threshold, key, field, label):
+    """Print changes in results' field against a previous run, returning the regressed entries
+
+    key(result) matches a result to its baseline entry and label(result)
+    names it in the printout.
+    """
+    with open(baseline_path) as f:
+        baseline = {key(r): r for r in json.load(f)['results']}
+    regressions = []
+    for result in results:
+        old = baseline.get(key(result))
+        if not old or old[field] == 0:
+            continue
+        ratio = result[field] / old[field]
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{label(result)} {field.split('_')[0]} x{ratio:.2f}{flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
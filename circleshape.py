@@ -1,22 +1,178 @@
+import math
+import random
 import pygame
+from collections import Counter
+from constants import *
+from entitystore import MOVING
+
+def sweep_fraction(start_x, start_y, move_x, move_y, distance):
+    """First t in [0, 1] at which |start + move * t| <= distance, or None"""
+    gap = start_x * start_x + start_y * start_y - distance * distance
+    if gap <= 0:
+        return 0.0
+    # Solve |start + move * t|^2 = distance^2 for the smaller root
+    a = move_x * move_x + move_y * move_y
+    b = start_x * move_x + start_y * move_y
+    if a == 0 or b >= 0:
+        return None  # not moving, or moving apart
+    discriminant = b * b - a * gap
+    if discriminant < 0:
+        return None
+    t = (-b - math.sqrt(discriminant)) / a
+    return t if t <= 1.0 else None
+
 
 class CircleShape(pygame.sprite.Sprite):
+    # Lifetime limits, overridden by subclasses (None disables the check)
+    offscreen_margin = None  # pixels past the screen edge before culling
+    max_age = None  # seconds
+    max_count = None  # live shapes allowed in the first container
+
+    # Optional EntityStore backing, see entitystore.enable_store
+    store = None
+    stored_fields = {}  # extra attributes kept in the store, attr -> array name
+    motion_flags = MOVING
+
+    # Random source for spawn variation, replaced by a seeded per-game RNG in init_game
+    rng = random
+
+    # Optional ObjectPool; recycled shapes are reset in place by __init__
+    pool = None
+    recycled = False  # set on a shape the pool hands back out, until __init__ has reset it
+
+    # Bookkeeping shared by all shapes, keyed by "ClassName.event"
+    lifetime_stats = Counter()
+
+    def __new__(cls, *args, **kwargs):
+        if cls.pool is not None:
+            shape = cls.pool.acquire()
+            if shape is not None:
+                shape.recycled = True
+                return shape
+        return super().__new__(cls)
+
     def __init__(self, x, y, radius):
-        if hasattr(self, "containers"):
+        recycled = self.recycled
+        if recycled:
+            # Pooled classes always have containers; the sprite only has to rejoin them.
+            # This is Sprite.add without its per-group type checks
+            self.recycled = False
+            for group in self.containers:
+                group.add_internal(self)
+                self.add_internal(group)
+        elif hasattr(self, "containers"):
             super().__init__(self.containers)
         else:
             super().__init__()
 
-        self.position = pygame.Vector2(x, y)
-        self.velocity = pygame.Vector2(0, 0)
+        # The store row has to exist before any stored attribute is assigned
+        self.slot = self.store.add(self, radius, self.motion_flags) if self.store is not None else None
+        if recycled and self.slot is None:
+            # Reuse the vectors in place
+            self.position.update(x, y)
+            self.velocity.update(0.0, 0.0)
+        else:
+            self.position = pygame.Vector2(x, y)
+            self.velocity = pygame.Vector2(0, 0)
         self.radius = radius
+        self.age = 0.0
+
+        self.lifetime_stats[f"{type(self).__name__}.spawned"] += 1
+        if self.max_count is not None:
+            self.enforce_max_count()
 
     def draw(self, screen):
         pass
 
+    def blit_image(self, screen):
+        """Blit the shape's cached sprite_image centred on its position"""
+        image = self.sprite_image()
+        if image is not None:
+            screen.blit(image, image.get_rect(center=self.position))
+
     def update(self):
         # Update logic for the circle can be added here
         pass
 
     def collides_with(self, other):
-        return self.position.distance_to(other.position) <= self.radius + other.radius
\ No newline at end of file
+        return self.position.distance_to(other.position) <= self.radius + other.radius
+
+    def travel_time(self, dt):
+        """Seconds the shape moved for in a step of dt; shapes spawned during the step haven't moved"""
+        return min(dt, self.age)
+
+    def swept_bounds(self, dt):
+        """Centre and radius of a circle covering the shape over the last step of dt"""
+        half = self.velocity * (self.travel_time(dt) / 2)
+        return self.position - half, self.radius + half.length()
+
+    def set_vector(self, attr, x, y):
+        """Set a Vector2 attribute, updating a recycled shape's vector in place rather than allocating
+
+        Stored attributes are written straight into the store row.
+        """
+        if self.slot is not None and attr in self.store.fields:
+            setattr(self, attr, (x, y))
+            return
+        vector = self.__dict__.get(attr)
+        if vector is None:
+            self.__dict__[attr] = pygame.Vector2(x, y)
+        else:
+            vector.update(x, y)
+
+    def set_motion(self, flags):
+        """Set the store motion flags for this shape (no-op without a store)"""
+        if self.slot is not None:
+            self.store.flags[self.slot] = flags
+
+    def kill(self):
+        was_alive = self.alive()
+        if self.slot is not None:
+            self.store.remove(self.slot)
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+    def on_release(self):
+        """Hook run when the shape goes back to its pool"""
+        pass
+
+    def is_offscreen(self, margin):
+        """Check if the shape is further than margin outside the screen"""
+        return (self.position.x < -margin or
+                self.position.x > SCREEN_WIDTH + margin or
+                self.position.y < -margin or
+                self.position.y > SCREEN_HEIGHT + margin)
+
+    def update_lifetime(self, dt):
+        """Age the shape and kill it once it leaves the screen or gets too old"""
+        self.age += dt
+        if self.offscreen_margin is not None and self.is_offscreen(self.offscreen_margin):
+            self.retire("culled")
+            return True
+        if self.max_age is not None and self.age >= self.max_age:
+            self.retire("expired")
+            return True
+        return False
+
+    def enforce_max_count(self):
+        """Kill the oldest shapes in the first container while it is over max_count"""
+        containers = getattr(self, "containers", None)
+        if not containers:
+            return
+        group = containers[0] if isinstance(containers, (tuple, list)) else containers
+        while len(group) > self.max_count:
+            # Groups keep insertion order, so the first sprite is the oldest
+            oldest = next(iter(group.spritedict))
+            oldest.retire("evicted")
+
+    def retire(self, reason):
+        """Kill the shape and record why it was removed
+
+        A shape killed earlier in the same update pass (evicted, say) is still
+        updated by that pass, so retiring a dead shape again is ignored.
+        """
+        if not self.alive():
+            return
+        self.lifetime_stats[f"{type(self).__name__}.{reason}"] += 1
+        self.kill()
@@ -1,26 +1,86 @@
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
+SIMULATION_TIMESTEP = 1 / 60  # seconds per headless simulation step
+SIMULATION_TICK_RATE = 60  # fixed simulation steps per second in the windowed game
+MAX_CATCH_UP_STEPS = 5  # most full steps run in one frame
+MAX_MERGED_TICKS = 3  # ticks past the catch-up limit folded into the frame's last step
+MAX_FRAME_TIME = 0.25  # longer frames (window drags, stalls) only count this long
+
 ASTEROID_MIN_RADIUS = 20
 ASTEROID_KINDS = 3
 ASTEROID_SPAWN_RATE = 0.8 # seconds
 ASTEROID_MAX_RADIUS = ASTEROID_MIN_RADIUS * ASTEROID_KINDS
+ASTEROID_OFFSCREEN_MARGIN = ASTEROID_MAX_RADIUS * 2  # asteroids spawn just outside the screen
+ASTEROID_MAX_COUNT = 200
+
+# Collision broad phase constants
+COLLISION_CELL_SIZE = ASTEROID_MAX_RADIUS * 2  # one cell spans the largest asteroid
 
 PLAYER_RADIUS = 20
 PLAYER_TURN_SPEED = 300
 PLAYER_SPEED = 200
 PLAYER_SHOOT_COOLDOWN = 0.3  # seconds
 PLAYER_SHOOT_SPEED = 500
+PLAYER_ROTATION_STEP = 5  # degrees between pre-rendered ship sprites
 
 SHOT_RADIUS = 5
+SHOT_MAX_AGE = 4.0  # seconds
+SHOT_MAX_COUNT = 100
 
 # Gold orb constants
 GOLD_ORB_RADIUS = 8
 GOLD_ORB_COLLECTION_DISTANCE = 30
 POINTS_PER_ORB = 100
+ORB_CLUSTER_MAX_PARTICLES = 12  # particles drawn for a weighted orb, however large its value
+
+# Object pool sizes (killed shapes kept for reuse)
+SHOT_POOL_SIZE = 64
+ASTEROID_POOL_SIZE = 256
+GOLD_ORB_POOL_SIZE = 1024
+METEORITE_POOL_SIZE = 8
+STAR_POOL_SIZE = 8
+
+# Entity store constants
+ENTITY_STORE_CAPACITY = 256  # initial rows per kind, doubled as needed
+DRIFT_FRICTION = 0.98  # velocity drifting orbs and stars keep per 1/60 s; raised to dt * 60 for other steps
+
+# Profiler constants
+PROFILER_HISTORY_FRAMES = 300  # rolling window, 5 seconds at 60 FPS
+PROFILER_DUMP_INTERVAL = 5.0  # seconds between dumps
+PROFILER_OVERLAY_REFRESH = 0.25  # seconds between overlay text updates
+
+# Logging constants
+LOG_FILE = "asteroids.log"
+LOG_LEVEL = 20  # gamelog.INFO; DEBUG is 10
+LOG_BUFFER_SIZE = 4096  # records held in memory before the oldest are dropped
+LOG_FLUSH_INTERVAL = 0.5  # seconds between writer thread drains
+
+# Scheduler constants
+TIMER_WHEEL_RESOLUTION = 1 / 120  # seconds per tick
+TIMER_WHEEL_SLOTS = 64  # slots per level, a power of two
+TIMER_WHEEL_LEVELS = 4  # 64 ** 4 ticks is about 39 hours at 120 ticks per second
+
+# Rendering constants
+DIRTY_RECT_FULL_UPDATE_FRACTION = 0.5  # flip the whole display past this fraction of the screen
+
+# Adaptive quality constants
+FRAME_BUDGET = 1 / 60  # seconds of work per frame before quality is reduced
+QUALITY_DOWNGRADE_FRAMES = 30  # consecutive frames over budget before dropping a level
+QUALITY_UPGRADE_FRAMES = 180  # consecutive frames with headroom before restoring a level
+QUALITY_HEADROOM = 0.6  # a frame has headroom under this fraction of the budget
+QUALITY_EFFECT_SCALE = 0.5  # resolution of translucent effects at reduced quality
+QUALITY_SPAWN_SLOWDOWN = 1.5  # spawn intervals are stretched by this when throttled
+ORB_MERGE_INTERVAL = 0.5  # seconds between orb merges while merging is on
+ORB_MERGE_DISTANCE = 24  # drifting orbs this close together are merged
+ORB_MERGE_PLAYER_DISTANCE = 150  # orbs nearer the player than this are left alone
+
+# Text rendering constants
+TEXT_CACHE_MAX_BYTES = 8 * 1024 * 1024  # rendered text surfaces kept in memory
 
 # High score constants
-HIGH_SCORE_FILE = "high_scores.txt"
+HIGH_SCORE_FILE = "high_scores.txt"  # legacy name,score table, imported into the database once
+HIGH_SCORE_DB = "high_scores.db"
 MAX_NAME_LENGTH = 15
 TOP_SCORES_COUNT = 3
 
@@ -37,6 +97,8 @@ STAR_BLINK_RATE = 0.3  # seconds
 STAR_COLLECTION_DISTANCE = 35
 STAR_EXPLOSION_RADIUS = 1000  # Large enough to cover entire screen
 STAR_EXPLOSION_DURATION = 0.5  # seconds
+STAR_EXPLOSION_COLOR = (255, 255, 0)
 STAR_CIRCLE_EXPANSION_DURATION = 0.3  # seconds - much faster
 ORB_BLINK_DURATION = 0.3  # seconds
 ORB_PULL_DURATION = 0.8  # seconds
+STAR_BLAST_ORBS_PER_STEP = 50  # orbs a star blast spawns per world step; a count, so replays match
@@ -0,0 +1,97 @@
+from constants import *
+
+
+class Effect:
+    """A timed visual effect; hidden for its first delay seconds, finished after duration
+
+    Timing comes from the clock of the EffectList it was added to, so a
+    running effect needs no per-frame update.
+    """
+
+    def __init__(self, duration, delay=0.0):
+        self.duration = duration
+        self.delay = delay
+        self.clock = None  # Scheduler whose time the effect follows, set by EffectList.add
+        self.start = 0.0
+
+    @property
+    def elapsed(self):
+        return self.clock.now - self.start if self.clock is not None else 0.0
+
+    @property
+    def done(self):
+        return self.elapsed >= self.duration
+
+    @property
+    def visible(self):
+        return self.delay <= self.elapsed < self.duration
+
+    @property
+    def progress(self):
+        """Fraction of the duration that has passed, from 0 to 1"""
+        return min(self.elapsed / self.duration, 1.0)
+
+    def draw(self, renderer):
+        pass
+
+
+class ExpandingCircle(Effect):
+    """Solid circle growing from position until it covers the whole screen"""
+
+    def __init__(self, position, duration, color=(255, 255, 255)):
+        super().__init__(duration)
+        self.position = position
+        self.color = color
+        # The corner furthest from the trigger point sets the final radius
+        self.max_radius = max(
+            position.distance_to(corner)
+            for corner in ((0, 0), (SCREEN_WIDTH, 0), (0, SCREEN_HEIGHT), (SCREEN_WIDTH, SCREEN_HEIGHT))
+        )
+
+    def draw(self, renderer):
+        renderer.draw_circle(self.color, self.position, self.max_radius * self.progress)
+
+
+class FadingCircle(Effect):
+    """Translucent circle following position whose alpha fades out over the duration"""
+
+    def __init__(self, position, radius, duration, delay=0.0, color=STAR_EXPLOSION_COLOR):
+        super().__init__(duration, delay)
+        self.position = position
+        self.radius = radius
+        self.color = color
+
+    def draw(self, renderer):
+        renderer.draw_circle(self.color, self.position, self.radius, int((1.0 - self.progress) * 255))
+
+
+class EffectList:
+    """Every running effect, drawn in the order started and removed by a scheduler timer when done"""
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.effects = {}  # effect -> removal timer, in the order started
+
+    def __len__(self):
+        return len(self.effects)
+
+    def add(self, effect):
+        effect.clock = self.scheduler
+        effect.start = self.scheduler.now
+        self.effects[effect] = self.scheduler.call_later(effect.duration, self.remove, effect)
+        return effect
+
+    def remove(self, effect):
+        timer = self.effects.pop(effect, None)
+        if timer is not None:
+            self.scheduler.cancel(timer)
+
+    def clear(self):
+        for timer in self.effects.values():
+            self.scheduler.cancel(timer)
+        self.effects.clear()
+
+    def draw(self, renderer):
+        for effect in self.effects:
+            if effect.visible:
+                effect.draw(renderer)
@@ -0,0 +1,253 @@
+import pygame
+from constants import *
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the sprite path works without it
+    np = None
+
+# Motion flags for each stored row
+MOVING = 1  # integrate position from velocity
+FRICTION = 2  # damp velocity by DRIFT_FRICTION per 1/60 s
+PULLING = 4  # lerp from the anchor to the pull target
+
+
+class EntityStore:
+    """Positions, velocities, radii and state flags for one kind of entity in NumPy arrays"""
+
+    def __init__(self, capacity=ENTITY_STORE_CAPACITY):
+        if np is None:
+            raise RuntimeError("EntityStore requires numpy")
+        self.count = 0
+        self.owners = []
+        self.fields = {}
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        """(Re)allocate the arrays, keeping the live rows"""
+        old = getattr(self, "positions", None)
+        arrays = {
+            'positions': np.zeros((capacity, 2)),
+            'velocities': np.zeros((capacity, 2)),
+            'anchors': np.zeros((capacity, 2)),
+            'radii': np.zeros(capacity),
+            'ages': np.zeros(capacity),
+            'timers': np.zeros(capacity),
+            'flags': np.zeros(capacity, dtype=np.uint8),
+        }
+        if old is not None:
+            for name, array in arrays.items():
+                array[:self.count] = getattr(self, name)[:self.count]
+        for name, array in arrays.items():
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def add(self, owner, radius, flags):
+        """Reserve a row for owner and return its slot"""
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+        slot = self.count
+        self.count += 1
+        self.owners.append(owner)
+        self.positions[slot] = 0.0
+        self.velocities[slot] = 0.0
+        self.anchors[slot] = 0.0
+        self.radii[slot] = radius
+        self.ages[slot] = 0.0
+        self.timers[slot] = 0.0
+        self.flags[slot] = flags
+        return slot
+
+    def remove(self, slot):
+        """Free a row, copying its values back onto the owner and moving the last row into it"""
+        owner = self.owners[slot]
+        for attr, array_name in self.fields.items():
+            owner.__dict__[attr] = self.read(array_name, slot)
+        owner.slot = None
+
+        last = self.count - 1
+        if slot != last:
+            for name in ('positions', 'velocities', 'anchors', 'radii', 'ages', 'timers', 'flags'):
+                array = getattr(self, name)
+                array[slot] = array[last]
+            moved = self.owners[last]
+            self.owners[slot] = moved
+            moved.slot = slot
+        self.owners.pop()
+        self.count = last
+
+    def read(self, array_name, slot):
+        array = getattr(self, array_name)
+        if array.ndim == 2:
+            return pygame.Vector2(float(array[slot, 0]), float(array[slot, 1]))
+        return float(array[slot])
+
+    def step(self, dt, now=0.0, pull_target=None, pull_duration=ORB_PULL_DURATION):
+        """Integrate every row and advance pulls to game time now, returning owners whose pull finished
+
+        Pulling rows keep the game time their pull started in timers.
+        """
+        n = self.count
+        if n == 0:
+            return []
+        flags = self.flags[:n]
+        positions = self.positions[:n]
+        velocities = self.velocities[:n]
+        self.ages[:n] += dt
+
+        friction = (flags & FRICTION) != 0
+        velocities[friction] *= DRIFT_FRICTION ** (dt * 60)
+        moving = (flags & MOVING) != 0
+        positions[moving] += velocities[moving] * dt
+
+        pulling = (flags & PULLING) != 0
+        if pull_target is None or not pulling.any():
+            return []
+        progress = (now - self.timers[:n][pulling]) / pull_duration
+        return self.lerp(pulling, (pull_target.x, pull_target.y), progress)
+
+    def lerp(self, mask, target, progress):
+        """Move masked rows from their anchor toward target, returning owners that arrived"""
+        n = self.count
+        anchors = self.anchors[:n][mask]
+        clamped = np.minimum(progress, 1.0)[:, None]
+        self.positions[:n][mask] = anchors + (np.asarray(target) - anchors) * clamped
+        arrived = np.flatnonzero(mask)[progress >= 1.0]
+        return [self.owners[i] for i in arrived]
+
+    def out_of_bounds(self, margin):
+        """Return owners further than margin outside the screen"""
+        positions = self.positions[:self.count]
+        outside = ((positions[:, 0] < -margin) | (positions[:, 0] > SCREEN_WIDTH + margin) |
+                   (positions[:, 1] < -margin) | (positions[:, 1] > SCREEN_HEIGHT + margin))
+        return [self.owners[i] for i in np.flatnonzero(outside)]
+
+    def older_than(self, max_age):
+        """Return owners whose age has reached max_age"""
+        return [self.owners[i] for i in np.flatnonzero(self.ages[:self.count] >= max_age)]
+
+    def cell_ranges(self, cell_size, dt=0.0):
+        """Return every row's (min_x, max_x, min_y, max_y) grid cells, as SpatialGrid.cell_range
+
+        With dt, the bounds cover the row's path over the last step, as
+        CircleShape.swept_bounds does.
+        """
+        n = self.count
+        centres = self.positions[:n]
+        radii = self.radii[:n]
+        if dt:
+            half = self.velocities[:n] * (np.minimum(dt, self.ages[:n]) / 2)[:, None]
+            centres = centres - half
+            radii = radii + np.sqrt(np.einsum('ij,ij->i', half, half))
+        low = np.floor_divide(centres - radii[:, None], cell_size).astype(np.int64)
+        high = np.floor_divide(centres + radii[:, None], cell_size).astype(np.int64)
+        return np.column_stack((low[:, 0], high[:, 0], low[:, 1], high[:, 1])).tolist()
+
+    def within(self, grid, position, distance, include_radii=False, flags=None):
+        """Return owners whose centre (or edge, with include_radii) is within distance of position
+
+        grid is the broad phase: a SpatialGrid filled from this store with
+        SpatialGrid.rebuild_store, and only the owners it finds are measured.
+        flags, if given, limits the result to rows whose motion flags equal it.
+        """
+        rows = [owner.slot for owner in grid.query(position, distance) if owner.slot is not None]
+        if not rows:
+            return []
+        rows = np.array(rows)
+        offsets = self.positions[rows] - (position.x, position.y)
+        limits = distance + self.radii[rows] if include_radii else distance
+        hits = np.einsum('ij,ij->i', offsets, offsets) <= limits * limits
+        if flags is not None:
+            hits &= self.flags[rows] == flags
+        return [self.owners[i] for i in rows[hits]]
+
+    def sweeping(self, other, dt, grid):
+        """Return (own, other) owner pairs whose circles touched during the last step of dt
+
+        grid is the broad phase: a SpatialGrid filled from other with
+        SpatialGrid.rebuild_store over the same dt. Each row's swept bounds pick
+        its candidates from the grid, as SpatialGrid.sweeping does, and only
+        those pairs are solved, together. Rows are taken to have moved in
+        straight lines for min(dt, age) seconds. Pairs come in own row order,
+        then earliest impact first.
+        """
+        if self.count == 0 or other.count == 0:
+            return []
+        query_cells = grid.query_cells
+        rows = []
+        cols = []
+        for row, cell_range in enumerate(self.cell_ranges(grid.cell_size, dt)):
+            for target in query_cells(*cell_range):
+                if target.slot is not None:
+                    rows.append(row)
+                    cols.append(target.slot)
+        if not rows:
+            return []
+        rows = np.array(rows)
+        cols = np.array(cols)
+
+        own_moves = self.velocities[rows] * np.minimum(dt, self.ages[rows])[:, None]
+        other_moves = other.velocities[cols] * np.minimum(dt, other.ages[cols])[:, None]
+        moves = own_moves - other_moves
+        starts = self.positions[rows] - other.positions[cols] - moves
+        limits = self.radii[rows] + other.radii[cols]
+
+        # Smaller root of |start + move * t|^2 = limit^2, as in sweep_fraction
+        gaps = np.einsum('ij,ij->i', starts, starts) - limits * limits
+        a = np.einsum('ij,ij->i', moves, moves)
+        b = np.einsum('ij,ij->i', starts, moves)
+        discriminants = b * b - a * gaps
+        approaching = (a > 0) & (b < 0) & (discriminants >= 0)
+        roots = (-b - np.sqrt(np.where(approaching, discriminants, 0.0))) / np.where(approaching, a, 1.0)
+        times = np.where(approaching & (roots <= 1.0), roots, np.inf)
+        times[gaps <= 0] = 0.0
+
+        hits = np.flatnonzero(np.isfinite(times))
+        order = hits[np.lexsort((times[hits], rows[hits]))]
+        return [(self.owners[rows[k]], other.owners[cols[k]]) for k in order]
+
+
+class StoredField:
+    """Descriptor that reads and writes an attribute through the owner's store row"""
+
+    def __init__(self, attr, array_name):
+        self.attr = attr
+        self.array_name = array_name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        slot = obj.__dict__.get('slot')
+        if slot is None:
+            return obj.__dict__[self.attr]
+        return obj.store.read(self.array_name, slot)
+
+    def __set__(self, obj, value):
+        slot = obj.__dict__.get('slot')
+        if slot is None:
+            obj.__dict__[self.attr] = value
+            return
+        array = getattr(obj.store, self.array_name)
+        if array.ndim == 2:
+            array[slot, 0] = value[0]
+            array[slot, 1] = value[1]
+        else:
+            array[slot] = value
+
+
+def enable_store(cls, store):
+    """Back cls's position, velocity and age (plus cls.stored_fields) with store"""
+    fields = {'position': 'positions', 'velocity': 'velocities', 'age': 'ages'}
+    fields.update(cls.stored_fields)
+    store.fields = fields
+    for attr, array_name in fields.items():
+        setattr(cls, attr, StoredField(attr, array_name))
+    cls.store = store
+
+def disable_store(cls):
+    """Return cls to plain per-instance attributes"""
+    if cls.__dict__.get('store') is None:
+        return
+    for attr in cls.store.fields:
+        delattr(cls, attr)
+    cls.store = None
@@ -0,0 +1,67 @@
+from constants import *
+
+
+class FixedStepClock:
+    """Turns variable frame times into simulation steps of a fixed length
+
+    Frame time goes into an accumulator and comes out as whole ticks of
+    1 / tick_rate seconds; the remainder carries over to the next frame and
+    alpha tells the renderer how far the display is between the last two
+    simulation states. A frame longer than max_frame_time only counts that
+    long, and at most max_steps steps run per frame: up to max_merge ticks
+    beyond that are folded into the last step, and any further backlog is
+    dropped, so one slow frame can't snowball into longer and longer catch-ups.
+    """
+
+    def __init__(self, tick_rate=SIMULATION_TICK_RATE, max_steps=MAX_CATCH_UP_STEPS, max_merge=MAX_MERGED_TICKS,
+                 max_frame_time=MAX_FRAME_TIME):
+        if tick_rate <= 0:
+            raise ValueError("tick_rate must be positive")
+        self.tick = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.max_merge = max_merge
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        # Totals since the clock was made
+        self.ticks = 0
+        self.merged_ticks = 0
+        self.dropped_ticks = 0
+        # The same for the last advance()
+        self.frame_ticks = 0
+        self.frame_merged = 0
+        self.frame_dropped = 0
+
+    @property
+    def alpha(self):
+        """Fraction of a tick between the last simulation state and the displayed time"""
+        return self.accumulator / self.tick
+
+    def reset(self):
+        """Forget leftover time, e.g. when the simulation resumes after a pause"""
+        self.accumulator = 0.0
+
+    def advance(self, frame_time):
+        """Add a frame's time and return the dt of each step to run, in order"""
+        tick = self.tick
+        dropped = 0
+        if frame_time > self.max_frame_time:
+            dropped += int((frame_time - self.max_frame_time) / tick)
+            frame_time = self.max_frame_time
+        self.accumulator += frame_time
+        ticks = int(self.accumulator / tick)
+        self.accumulator -= ticks * tick
+
+        steps = [tick] * min(ticks, self.max_steps)
+        merged = 0
+        if ticks > self.max_steps:
+            merged = min(ticks - self.max_steps, self.max_merge)
+            dropped += ticks - self.max_steps - merged
+            steps[-1] += merged * tick
+
+        self.frame_ticks = len(steps) + merged
+        self.frame_merged = merged
+        self.frame_dropped = dropped
+        self.ticks += self.frame_ticks
+        self.merged_ticks += merged
+        self.dropped_ticks += dropped
+        return steps
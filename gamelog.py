@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import deque
+
+from constants import *
+
+# Levels, lowest to highest
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+
+
+def timestamp(seconds):
+    return time.strftime('%H:%M:%S', time.localtime(seconds)) + f".{int(seconds % 1 * 1000):03d}"
+
+
+class GameLog:
+    """Levelled logger that queues records in memory for a background writer thread
+
+    Logging a message only appends a tuple to a bounded deque (atomic, so no lock
+    is taken in the frame loop); formatting and file I/O happen on the writer
+    thread. Hot paths guard calls with the debug_on/info_on flags so disabled
+    messages don't even build their arguments. Arguments are formatted later on
+    another thread, so pass immutable values (tuples, numbers, strings).
+    """
+
+    def __init__(self, level=LOG_LEVEL, capacity=LOG_BUFFER_SIZE):
+        self.records = deque(maxlen=capacity)
+        self.capacity = capacity
+        self.dropped = 0  # records overwritten before the writer drained them
+        self.path = None
+        self.thread = None
+        self.wake = threading.Event()
+        self.stopping = False
+        self.set_level(level)
+
+    def set_level(self, level):
+        self.level = level
+        self.debug_on = level <= DEBUG
+        self.info_on = level <= INFO
+
+    def log(self, level, message, *args):
+        if level < self.level:
+            return
+        records = self.records
+        if len(records) == self.capacity:
+            self.dropped += 1
+        records.append((time.time(), level, message, args))
+
+    def debug(self, message, *args):
+        if self.debug_on:
+            self.log(DEBUG, message, *args)
+
+    def info(self, message, *args):
+        if self.info_on:
+            self.log(INFO, message, *args)
+
+    def warning(self, message, *args):
+        self.log(WARNING, message, *args)
+
+    def error(self, message, *args):
+        self.log(ERROR, message, *args)
+
+    def start(self, path=LOG_FILE, interval=LOG_FLUSH_INTERVAL):
+        """Start the writer thread, appending to path every interval seconds"""
+        if self.thread is not None:
+            return
+        self.path = path
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, args=(interval,), name="gamelog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the writer thread after it has written everything queued so far"""
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
+        self.wake.clear()
+
+    def run(self, interval):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            while True:
+                self.wake.wait(interval)
+                self.drain(f)
+                if self.stopping:
+                    return
+
+    def drain(self, f):
+        """Write out every queued record"""
+        records = self.records
+        lines = []
+        while records:
+            created, level, message, args = records.popleft()
+            if args:
+                try:
+                    message = message % args
+                except (TypeError, ValueError):
+                    message = f"{message} {args!r}"
+            lines.append(f"{timestamp(created)} {LEVEL_NAMES.get(level, level)} {message}\n")
+        if self.dropped:
+            lines.append(f"{timestamp(time.time())} {LEVEL_NAMES[WARNING]} {self.dropped} log records dropped\n")
+            self.dropped = 0
+        if lines:
+            f.writelines(lines)
+            f.flush()
+
+
+# Shared logger; records stay in the bounded buffer until start() is called
+log = GameLog()
@@ -0,0 +1,384 @@
+import random
+import zlib
+import pygame
+
+from constants import *
+from circleshape import CircleShape
+from player import Player
+from asteroid import Asteroid
+from asteroidfield import AsteroidField
+from shot import Shot
+from goldorb import GoldOrb
+from meteorite import Meteorite
+from star import Star
+from spatialgrid import SpatialGrid
+from starblast import StarBlast
+from effects import EffectList, ExpandingCircle, FadingCircle
+from scheduler import Scheduler
+from orbstates import OrbStates
+from pool import ObjectPool
+from entitystore import EntityStore, enable_store, disable_store, np
+from gamelog import log
+
+# Entity kinds that can be backed by an EntityStore
+STORED_CLASSES = (Asteroid, Shot, Meteorite, GoldOrb, Star)
+# Kinds whose per-object update is fully replaced by the store
+BULK_CLASSES = (Asteroid, Shot, Meteorite)
+# Pooled kinds and their free list caps
+POOL_SIZES = {
+    Shot: SHOT_POOL_SIZE,
+    Asteroid: ASTEROID_POOL_SIZE,
+    GoldOrb: GOLD_ORB_POOL_SIZE,
+    Meteorite: METEORITE_POOL_SIZE,
+    Star: STAR_POOL_SIZE,
+}
+
+
+def init_game(use_entity_store=False, use_pools=True, rng=random, scheduler=None):
+    updatable = pygame.sprite.Group()
+    drawable = pygame.sprite.Group()
+    asteroids = pygame.sprite.Group()
+    shots = pygame.sprite.Group()
+    orbs = pygame.sprite.Group()
+    meteorites = pygame.sprite.Group()
+    stars = pygame.sprite.Group()
+
+    for cls in STORED_CLASSES:
+        disable_store(cls)
+        if use_entity_store:
+            enable_store(cls, EntityStore())
+
+    for cls, size in POOL_SIZES.items():
+        cls.pool = ObjectPool(size) if use_pools else None
+
+    # Every spawn draws from the same per-game RNG so a seed reproduces the game
+    for cls in (Asteroid, GoldOrb, Meteorite, Star, AsteroidField):
+        cls.rng = rng
+    # Spawns, cooldowns and animations run on the world's game-time scheduler
+    scheduler = scheduler if scheduler is not None else Scheduler()
+    for cls in (AsteroidField, Player, Star):
+        cls.scheduler = scheduler
+    # Orb state tracking also needs the player, GameWorld sets it up
+    GoldOrb.states = None
+    # Spawn and removal counts are per game
+    CircleShape.lifetime_stats.clear()
+
+    Asteroid.containers = (asteroids, updatable, drawable)
+    Shot.containers = (shots, updatable, drawable)
+    GoldOrb.containers = (orbs, updatable, drawable)
+    Meteorite.containers = (meteorites, updatable, drawable)
+    Star.containers = (stars, updatable, drawable)
+    if use_entity_store:
+        # The store moves and culls these kinds, so they skip per-object updates
+        for cls in BULK_CLASSES:
+            cls.containers = tuple(group for group in cls.containers if group is not updatable)
+    asteroid_field = AsteroidField()
+    Player.containers = (updatable, drawable)
+    player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+    return updatable, drawable, asteroids, shots, orbs, meteorites, stars, asteroid_field, player
+
+def spawn_meteorite(rng=random):
+    """Spawn a meteorite from a random edge"""
+    edge = rng.choice(['top', 'bottom', 'left', 'right'])
+
+    if edge == 'top':
+        x = rng.randint(0, SCREEN_WIDTH)
+        y = -METEORITE_RADIUS
+    elif edge == 'bottom':
+        x = rng.randint(0, SCREEN_WIDTH)
+        y = SCREEN_HEIGHT + METEORITE_RADIUS
+    elif edge == 'left':
+        x = -METEORITE_RADIUS
+        y = rng.randint(0, SCREEN_HEIGHT)
+    else:  # right
+        x = SCREEN_WIDTH + METEORITE_RADIUS
+        y = rng.randint(0, SCREEN_HEIGHT)
+
+    return Meteorite(x, y)
+
+
+class GameWorld:
+    """The game rules for one round, advanced one step at a time with no display"""
+
+    def __init__(self, seed=None, use_entity_store=False, use_pools=True):
+        if use_entity_store and np is None:
+            raise RuntimeError("use_entity_store requires numpy")
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.rng = random.Random(self.seed)
+        self.use_entity_store = use_entity_store
+        self.scheduler = Scheduler()  # game-time timers, advanced once per step
+        (self.updatable, self.drawable, self.asteroids, self.shots, self.orbs,
+         self.meteorites, self.stars, self.asteroid_field, self.player) = init_game(
+            use_entity_store, use_pools, self.rng, self.scheduler)
+        self.orb_states = OrbStates(self.scheduler, self.player)
+        GoldOrb.states = self.orb_states
+
+        self.meteorite_timer = self.scheduler.call_every(METEORITE_SPAWN_RATE, self.spawn_timed_meteorite)
+        self.spawn_slowdown = 1.0  # spawn interval multiplier set by the quality governor
+        self.merge_timer = None  # repeating orb merge while the quality governor asks for it
+        self.effects = EffectList(self.scheduler)  # visual effects, timed in game time
+        self.game_over = False
+        self.frame = 0
+        self.blasts = []  # star blasts still spawning orbs
+        self.blast_budget = STAR_BLAST_ORBS_PER_STEP
+        self.profiler = None  # optional FrameProfiler timing each step phase
+        self.previous_positions = {}  # sprite -> (x, y) saved by remember_positions
+
+        self.asteroid_grid = SpatialGrid()
+        self.meteorite_grid = SpatialGrid()
+        self.orb_grid = SpatialGrid()
+        self.star_grid = SpatialGrid()
+        self.merge_grid = SpatialGrid(ORB_MERGE_DISTANCE * 2)
+
+    def game_objects(self):
+        """Return the object references expected by UtilityCommands"""
+        return {
+            'player': self.player,
+            'asteroids': self.asteroids,
+            'orbs': self.orbs,
+            'meteorites': self.meteorites,
+            'stars': self.stars,
+            'updatable': self.updatable,
+            'drawable': self.drawable,
+            'world': self
+        }
+
+    def step(self, inputs, dt=SIMULATION_TIMESTEP):
+        """Advance the world by dt seconds using the given InputState"""
+        profiler = self.profiler
+        self.frame += 1
+        self.player.controls = inputs
+        self.update_entities(dt)
+        if profiler:
+            profiler.lap('update')
+        self.resolve_collisions(dt)
+        if profiler:
+            profiler.lap('collisions')
+        self.collect_stars()
+
+        # Activate star power
+        if inputs.use_star and self.player.stars_collected > 0:
+            if self.player.consume_star():
+                self.use_star_power()
+        if profiler:
+            profiler.lap('pickups')
+
+    def remember_positions(self):
+        """Save where every drawable is, for drawing between this state and the next step's"""
+        self.previous_positions = {sprite: (sprite.position.x, sprite.position.y) for sprite in self.drawable}
+
+    def update_entities(self, dt):
+        """Advance timers, then move everything"""
+        # Shapes killed last step are no longer referenced and can be reused
+        for cls in POOL_SIZES:
+            if cls.pool is not None:
+                cls.pool.recycle()
+
+        # Timers first, so spawns, state changes and cooldowns are current for this step's movement
+        self.scheduler.advance(dt)
+        if self.use_entity_store:
+            self.step_stores(dt)
+        self.updatable.update(dt)
+
+        # Finish spawning orbs from star blasts started on earlier frames
+        if self.blasts:
+            self.blasts = [blast for blast in self.blasts if not blast.advance(self.blast_budget)]
+
+    def spawn_timed_meteorite(self):
+        """Meteorite spawn timer callback"""
+        # Only spawn meteorites if player doesn't have a star
+        if self.player.stars_collected == 0:
+            new_meteorite = spawn_meteorite(self.rng)
+            self.meteorites.add(new_meteorite)
+            self.updatable.add(new_meteorite)
+            self.drawable.add(new_meteorite)
+
+    def set_spawn_rates(self, asteroids=None, meteorites=None):
+        """Change the seconds between asteroid and/or meteorite spawns while the game runs"""
+        if asteroids is not None:
+            self.asteroid_field.set_spawn_rate(asteroids)
+        if meteorites is not None:
+            self.meteorite_timer = self.scheduler.set_interval(self.meteorite_timer, meteorites)
+
+    def set_spawn_slowdown(self, factor):
+        """Stretch both spawn intervals by factor (1 for the normal rates)"""
+        if factor != self.spawn_slowdown:
+            self.spawn_slowdown = factor
+            self.set_spawn_rates(ASTEROID_SPAWN_RATE * factor, METEORITE_SPAWN_RATE * factor)
+
+    def set_orb_merging(self, enabled):
+        """Start or stop merging drifting orbs every ORB_MERGE_INTERVAL"""
+        if enabled and self.merge_timer is None:
+            self.merge_timer = self.scheduler.call_every(ORB_MERGE_INTERVAL, self.merge_orbs)
+        elif not enabled and self.merge_timer is not None:
+            self.scheduler.cancel(self.merge_timer)
+            self.merge_timer = None
+
+    def merge_orbs(self, distance=ORB_MERGE_DISTANCE):
+        """Fold drifting orbs away from the player into nearby ones, which take over their value"""
+        normal = self.orb_states.normal
+        if len(normal) < 2:
+            return 0
+        player_position = self.player.position
+        candidates = [orb for orb in normal
+                      if orb.position.distance_to(player_position) > ORB_MERGE_PLAYER_DISTANCE]
+        grid = self.merge_grid
+        grid.rebuild(candidates)
+        merged = 0
+        for orb in candidates:
+            if not orb.alive():
+                continue
+            for other in grid.within(orb.position, distance):
+                if other is not orb:
+                    orb.value += other.value
+                    other.retire("merged")
+                    merged += 1
+        return merged
+
+    def resolve_collisions(self, dt=0.0):
+        """Run the player, shot and orb pickup collision passes
+
+        Shots are swept against asteroids and meteorites over the last step of
+        dt, so a long step can't carry them through a target.
+        """
+        player = self.player
+
+        # Rebuild the broad phase grids for this frame; shot targets cover their path over the step
+        if self.use_entity_store:
+            self.asteroid_grid.rebuild_store(Asteroid.store, dt)
+            self.meteorite_grid.rebuild_store(Meteorite.store, dt)
+            self.orb_grid.rebuild_store(GoldOrb.store)
+            self.star_grid.rebuild_store(Star.store)
+        else:
+            self.asteroid_grid.rebuild(self.asteroids, dt)
+            self.meteorite_grid.rebuild(self.meteorites, dt)
+            self.orb_grid.rebuild(self.orb_states.normal)
+            self.star_grid.rebuild(self.stars)
+
+        # Check player collision with asteroids
+        if self.asteroids_hitting(player):
+            self.game_over = True
+
+        # Check shot collisions with asteroids; a shot stops at the first live target it reaches
+        for shot, asteroid in self.shot_hits(Asteroid, self.asteroid_grid, dt):
+            if shot.alive() and asteroid.alive():
+                shot.kill()
+                # Get orbs from destroyed asteroid
+                new_orbs = asteroid.split()
+                if new_orbs:
+                    for orb in new_orbs:
+                        self.orbs.add(orb)
+                        self.updatable.add(orb)
+                        self.drawable.add(orb)
+
+        # Check shot collisions with meteorites
+        for shot, meteorite in self.shot_hits(Meteorite, self.meteorite_grid, dt):
+            if shot.alive() and meteorite.alive():
+                shot.kill()
+                # Create blinking star from destroyed meteorite
+                new_star = meteorite.destroy()
+                if log.debug_on:
+                    log.debug("Created blinking star at (%.0f, %.0f)", new_star.position.x, new_star.position.y)
+                self.stars.add(new_star)
+                self.updatable.add(new_star)
+                self.drawable.add(new_star)
+
+        # Check for orb collection near the player (only drifting orbs can be picked up)
+        for orb in self.near_player(GoldOrb, self.orb_grid, GOLD_ORB_COLLECTION_DISTANCE, GoldOrb.motion_flags):
+            player.collect_orb(orb)
+
+    def collect_stars(self):
+        """Check for star collection"""
+        for star in self.near_player(Star, self.star_grid, STAR_COLLECTION_DISTANCE):
+            if log.debug_on:
+                log.debug("Star collected by player")
+            self.player.collect_star(star)
+
+    def entity_counts(self):
+        """Return the number of live entities in each group"""
+        return {
+            'asteroids': len(self.asteroids),
+            'shots': len(self.shots),
+            'orbs': len(self.orbs),
+            'meteorites': len(self.meteorites),
+            'stars': len(self.stars),
+        }
+
+    def checksum(self):
+        """CRC of the score and every entity's position, for checking a replay reached the same state"""
+        state = [self.frame, self.player.points, self.player.stars_collected, tuple(self.player.position)]
+        for group in (self.asteroids, self.shots, self.orbs, self.meteorites, self.stars):
+            state.append([(shape.position.x, shape.position.y) for shape in group])
+        return zlib.crc32(repr(state).encode())
+
+    def lifetime_stats(self):
+        """Return how many shapes of each kind were spawned and why they were removed, this game"""
+        return dict(sorted(CircleShape.lifetime_stats.items()))
+
+    def pool_stats(self):
+        """Return hit/miss statistics for each pooled class"""
+        return {cls.__name__: cls.pool.stats() for cls in POOL_SIZES if cls.pool is not None}
+
+    def step_stores(self, dt):
+        """Move every stored entity in bulk, then finish pulls and cull strays"""
+        for cls in STORED_CLASSES:
+            store = cls.store
+            for orb in store.step(dt, self.scheduler.now, self.player.position):
+                # Pulling complete, orb is collected
+                orb.kill()
+            if cls.offscreen_margin is not None:
+                for shape in store.out_of_bounds(cls.offscreen_margin):
+                    shape.retire("culled")
+            if cls.max_age is not None:
+                for shape in store.older_than(cls.max_age):
+                    shape.retire("expired")
+
+    def asteroids_hitting(self, shape):
+        """Return the asteroids overlapping shape"""
+        if self.use_entity_store:
+            return Asteroid.store.within(self.asteroid_grid, shape.position, shape.radius, include_radii=True)
+        return self.asteroid_grid.colliding(shape)
+
+    def shot_hits(self, target_cls, grid, dt=0.0):
+        """Return (shot, target) pairs for live shots that touched a target kind during the last step of dt
+
+        Each shot's targets come earliest impact first.
+        """
+        if self.use_entity_store:
+            return [(shot, target) for shot, target in Shot.store.sweeping(target_cls.store, dt, grid)
+                    if shot.alive()]
+        return [(shot, target) for shot in self.shots for _, target in grid.sweeping(shot, dt)]
+
+    def near_player(self, target_cls, grid, distance, flags=None):
+        """Return live entities of a kind whose centre is within distance of the player
+
+        In store mode the grid holds the whole store, and flags limits the search to
+        rows with exactly those motion flags; otherwise the grid is expected to hold
+        only matching entities already.
+        """
+        if self.use_entity_store:
+            return target_cls.store.within(grid, self.player.position, distance, flags=flags)
+        return grid.within(self.player.position, distance)
+
+    def use_star_power(self):
+        """Vaporize every asteroid into orbs and pull all orbs to the player"""
+        player = self.player
+        player.use_star_power()
+
+        # White circle expansion, then the yellow explosion fading out once it has covered the screen
+        self.effects.add(ExpandingCircle(player.position, STAR_CIRCLE_EXPANSION_DURATION))
+        self.effects.add(FadingCircle(player.position, STAR_EXPLOSION_RADIUS, STAR_EXPLOSION_DURATION,
+                                      delay=STAR_CIRCLE_EXPANSION_DURATION))
+
+        # VAPORIZE ALL asteroids on screen (no distance check needed)
+        blast = self.start_star_blast()
+        if log.debug_on:
+            log.debug("Destroyed %d asteroids, creating %d orbs", blast.asteroid_count, blast.orb_total)
+
+    def start_star_blast(self):
+        """Start converting every asteroid to orbs, blast_budget orbs per step"""
+        blast = StarBlast(self.player, self.asteroids, self.orb_states)
+        blast.advance(self.blast_budget)
+        if not blast.done:
+            self.blasts.append(blast)
+        return blast
@@ -1,57 +1,49 @@
-import pygame
-import random
 from constants import *
 from circleshape import CircleShape
+from spritecache import sprite_cache
+from entitystore import MOVING, FRICTION, PULLING
 
 
 class GoldOrb(CircleShape):
-    def __init__(self, x, y):
+    stored_fields = {'pull_start': 'timers', 'original_position': 'anchors'}
+    motion_flags = MOVING | FRICTION
+
+    # OrbStates tracking every orb by animation state, set in init_game
+    states = None
+
+    def __init__(self, x, y, value=1):
         super().__init__(x, y, GOLD_ORB_RADIUS)
         # Add a slight random velocity to make orbs drift
-        self.velocity = pygame.Vector2(
-            random.uniform(-20, 20),
-            random.uniform(-20, 20)
-        )
+        self.set_vector('velocity', self.rng.uniform(-20, 20), self.rng.uniform(-20, 20))
         # Animation states
         self.animation_state = 'normal'  # 'normal', 'blinking', 'pulling'
-        self.animation_timer = 0.0
-        self.original_position = pygame.Vector2(x, y)
+        self.pull_start = 0.0  # game time the pull toward the player began
+        self.set_vector('original_position', x, y)
         self.target_position = None
         self.visible = True
-        self.scored = False  # Track if points have been awarded for this orb
+        self.value = value  # orbs this one stands for, each worth POINTS_PER_ORB
+        self.timer = None  # pending state change on the world's scheduler
+        self.state_group = None  # the OrbStates group holding this orb
+        self.state_changed()
 
-    def draw(self, screen):
+    def sprite_image(self):
         if not self.visible:
-            return
-            
-        # Draw a golden circle with a slight glow effect
-        pygame.draw.circle(screen, (255, 215, 0), self.position, self.radius)
-        pygame.draw.circle(screen, (255, 255, 0), self.position, self.radius - 2)
+            return None
+        # A golden circle with a slight glow effect, or a cluster for a weighted orb
+        return sprite_cache.orb(self.value)
+
+    def draw(self, screen):
+        self.blit_image(screen)
 
     def update(self, dt):
-        if self.animation_state == 'blinking':
-            self.update_blink_animation(dt)
+        if self.slot is not None:
+            # Moved by the store
+            return
+        if self.animation_state == 'normal':
+            self.velocity *= DRIFT_FRICTION ** (dt * 60)
+            self.position += self.velocity * dt
         elif self.animation_state == 'pulling':
             self.update_pull_animation(dt)
-        else:
-            # Normal behavior
-            self.velocity *= 0.98
-            self.position += self.velocity * dt
-
-    def update_blink_animation(self, dt):
-        """Update blinking into existence animation"""
-        self.animation_timer += dt
-        progress = self.animation_timer / ORB_BLINK_DURATION
-        
-        if progress >= 1.0:
-            # Blinking complete, start pulling to player
-            self.animation_state = 'pulling'
-            self.animation_timer = 0.0
-            self.visible = True
-            # Note: target_position will be set by the main game loop
-        else:
-            # Blink effect - fade in
-            self.visible = progress > 0.5
 
     def update_pull_animation(self, dt):
         """Update pulling to player animation"""
@@ -59,35 +51,59 @@ class GoldOrb(CircleShape):
             # If no target set, just stay in place
             return
             
-        self.animation_timer += dt
-        progress = self.animation_timer / ORB_PULL_DURATION
-        
-        if progress >= 1.0:
-            # Pulling complete, orb is collected
-            self.kill()
-        else:
-            # Smooth movement towards target
-            self.position = self.original_position.lerp(self.target_position, progress)
+        progress = min((self.states.scheduler.now - self.pull_start) / ORB_PULL_DURATION, 1.0)
+        # Smooth movement towards target; the pull timer collects the orb at the end
+        self.position = self.original_position.lerp(self.target_position, progress)
+
+    def state_changed(self):
+        if self.states is not None:
+            self.states.changed(self)
 
     def start_blink_animation(self):
         """Start the blink into existence animation"""
         self.animation_state = 'blinking'
-        self.animation_timer = 0.0
         self.visible = False
+        self.set_motion(0)
+        self.state_changed()
+
+    def show(self):
+        """Halfway through the blink the orb fades in"""
+        self.visible = True
+        self.timer = self.states.scheduler.call_at(self.blink_end, self.finish_blink)
+
+    def finish_blink(self):
+        """Blinking complete, start pulling to the player"""
+        self.animation_state = 'pulling'
+        self.visible = True
+        if self.target_position:
+            self.set_motion(PULLING)
+        self.state_changed()
 
     def start_pull_animation(self, target_position):
         """Start the pull to player animation"""
         self.animation_state = 'pulling'
-        self.animation_timer = 0.0
         self.original_position = self.position.copy()
         self.target_position = target_position
         self.visible = True
+        self.set_motion(PULLING)
+        self.state_changed()
 
     def set_pull_target(self, target_position):
         """Set the target position for pulling (used when blinking completes)"""
         self.target_position = target_position
         self.original_position = self.position.copy()
+        if self.animation_state == 'pulling':
+            self.set_motion(PULLING)
+
+    def kill(self):
+        if self.states is not None:
+            self.states.remove(self)
+        super().kill()
+
+    def on_release(self):
+        # Don't keep the player's position alive from the pool
+        self.target_position = None
 
     def is_collected_by(self, player):
         """Check if the orb is close enough to be collected by the player"""
-        return self.position.distance_to(player.position) <= GOLD_ORB_COLLECTION_DISTANCE 
\ No newline at end of file
+        return self.position.distance_to(player.position) <= GOLD_ORB_COLLECTION_DISTANCE 
@@ -0,0 +1,72 @@
+from constants import *
+from spritecache import sprite_cache
+from gamelog import log
+
+# What each quality level gives up, on top of the levels before it
+QUALITY_STEPS = ('full', 'simple sprites', 'low-res effects', 'fewer spawns', 'merged orbs')
+
+
+class QualityGovernor:
+    """Trades detail and spawn pressure for frame time when frames run over budget
+
+    Each frame's busy time is compared with the budget. After
+    QUALITY_DOWNGRADE_FRAMES frames in a row over it, quality drops one level;
+    after QUALITY_UPGRADE_FRAMES frames in a row under QUALITY_HEADROOM of it,
+    quality comes back up one level. level is 0 at full quality and is
+    reported with the profiler's counts.
+    """
+
+    def __init__(self, renderer=None, world=None, budget=FRAME_BUDGET):
+        self.renderer = renderer
+        self.world = world
+        self.budget = budget
+        self.enabled = True
+        self.level = 0
+        self.over = 0  # consecutive frames over budget
+        self.under = 0  # consecutive frames with headroom
+        self.changes = 0
+        self.apply()
+
+    @property
+    def name(self):
+        return QUALITY_STEPS[self.level]
+
+    def attach(self, world):
+        """Govern a new world at the current level"""
+        self.world = world
+        self.apply()
+
+    def record(self, busy):
+        """Account for a frame that took busy seconds of work"""
+        if not self.enabled:
+            return
+        if busy > self.budget:
+            self.over += 1
+            self.under = 0
+            if self.over >= QUALITY_DOWNGRADE_FRAMES and self.level < len(QUALITY_STEPS) - 1:
+                self.set_level(self.level + 1)
+        elif busy < self.budget * QUALITY_HEADROOM:
+            self.under += 1
+            self.over = 0
+            if self.under >= QUALITY_UPGRADE_FRAMES and self.level > 0:
+                self.set_level(self.level - 1)
+        else:
+            self.over = self.under = 0
+
+    def set_level(self, level):
+        self.level = level
+        self.over = self.under = 0
+        self.changes += 1
+        if log.info_on:
+            log.info("Quality level %d (%s)", level, QUALITY_STEPS[level])
+        self.apply()
+
+    def apply(self):
+        """Push the current level's settings to the sprite cache, renderer and world"""
+        level = self.level
+        sprite_cache.set_detail(level < 1)
+        if self.renderer is not None:
+            self.renderer.set_effect_scale(QUALITY_EFFECT_SCALE if level >= 2 else 1.0)
+        if self.world is not None:
+            self.world.set_spawn_slowdown(QUALITY_SPAWN_SLOWDOWN if level >= 3 else 1.0)
+            self.world.set_orb_merging(level >= 4)
@@ -0,0 +1,70 @@
+import argparse
+import random
+import time
+
+from constants import *
+from gameworld import GameWorld
+from inputstate import InputState
+
+
+def random_policy(rng, hold_frames=20):
+    """Return a policy that presses random controls, holding each choice for a while"""
+    current = InputState()
+
+    def policy(world, frame):
+        nonlocal current
+        if frame % hold_frames == 0:
+            current = InputState(
+                left=rng.random() < 0.3,
+                right=rng.random() < 0.3,
+                forward=rng.random() < 0.5,
+                backward=rng.random() < 0.1,
+                shoot=rng.random() < 0.8,
+                use_star=rng.random() < 0.5,
+            )
+        return current
+
+    return policy
+
+def run_headless(frames, dt=SIMULATION_TIMESTEP, seed=None, policy=None, stop_on_game_over=True,
+                 use_entity_store=False):
+    """Step a GameWorld without a window and return a summary of the run"""
+    if policy is None:
+        policy = random_policy(random.Random(seed))
+
+    world = GameWorld(seed, use_entity_store)
+    start = time.perf_counter()
+    for frame in range(frames):
+        world.step(policy(world, frame), dt)
+        if world.game_over and stop_on_game_over:
+            break
+    elapsed = time.perf_counter() - start
+
+    return {
+        'frames': world.frame,
+        'elapsed': elapsed,
+        'frames_per_second': world.frame / elapsed if elapsed > 0 else 0.0,
+        'survival_time': world.frame * dt,
+        'score': world.player.points,
+        'game_over': world.game_over,
+        'lifetimes': world.lifetime_stats(),
+        'pools': world.pool_stats(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game rules without a window")
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--dt", type=float, default=SIMULATION_TIMESTEP)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--keep-going", action="store_true", help="keep stepping after game over")
+    parser.add_argument("--entity-store", action="store_true", help="move entities with the NumPy entity store")
+    args = parser.parse_args()
+
+    result = run_headless(args.frames, args.dt, args.seed, stop_on_game_over=not args.keep_going,
+                          use_entity_store=args.entity_store)
+    for key, value in result.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
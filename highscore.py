@@ -1,44 +1,122 @@
-import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
 import pygame
 from constants import *
+from textcache import text_renderer
+from scorestore import ScoreStore
+from gamelog import log
+
+
+def open_store(path=HIGH_SCORE_DB):
+    """Open the score database, or return None (scores kept for this session only) if it can't be opened"""
+    try:
+        return ScoreStore(path)
+    except (sqlite3.Error, OSError) as e:
+        log.warning("Could not open high score database %s: %s", path, str(e))
+        return None
 
 
 class HighScore:
-    def __init__(self):
-        self.scores = self.load_scores()
+    """The top scores, cached in memory in front of the persistent ScoreStore
+
+    The frame loop only reads the cache. Without an explicit store, a writer
+    thread opens the database, loads the table and then writes queued scores
+    behind the game, so neither startup nor game over waits on disk. Scores
+    added in quick succession go out in one transaction. The writer publishes
+    the stored top scores as a (version, scores) tuple, which the game thread
+    picks up the next time it looks at the table; until the first load
+    arrives the list shows placeholders.
+    """
+
+    def __init__(self, store=None, path=HIGH_SCORE_DB):
+        self.scores = []  # top TOP_SCORES_COUNT (name, score), highest first
+        self.loaded = False
+        self.panel = None  # Cached high score list, rebuilt when the scores change
+        self.pending = deque()  # (name, score, created) waiting to be written
+        self.published = (0, None)  # (version, top scores) from the writer
+        self.seen = 0  # version of the published scores in use
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = None
+        self.store = store
+        if store is not None:
+            # Caller-owned store, used synchronously on this thread
+            self.scores = self.load_scores()
+            self.loaded = True
+        else:
+            self.thread = threading.Thread(target=self.run, args=(path,), name="highscores", daemon=True)
+            self.thread.start()
     
     def load_scores(self):
-        """Load high scores from file"""
-        scores = []
-        if os.path.exists(HIGH_SCORE_FILE):
-            try:
-                with open(HIGH_SCORE_FILE, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            parts = line.split(',')
-                            if len(parts) == 2:
-                                name = parts[0]
-                                score = int(parts[1])
-                                scores.append((name, score))
-            except:
-                pass
-        
-        # Sort by score (highest first) and keep only top 3
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:TOP_SCORES_COUNT]
+        """Load the top scores from the store"""
+        if self.store is None:
+            return []
+        try:
+            return self.store.top(TOP_SCORES_COUNT)
+        except sqlite3.Error as e:
+            log.warning("Could not load high scores: %s", str(e))
+            return []
     
-    def save_scores(self):
-        """Save high scores to file"""
+    def save_scores(self, entries):
+        """Record (name, score, created) entries in the store"""
+        if self.store is None or not entries:
+            return
         try:
-            with open(HIGH_SCORE_FILE, 'w') as f:
-                for name, score in self.scores:
-                    f.write(f"{name},{score}\n")
-        except:
-            pass
+            self.store.add_many(entries)
+        except sqlite3.Error as e:
+            log.warning("Could not save %d high scores: %s", len(entries), str(e))
+    
+    def run(self, path):
+        """Writer thread: load the table, then write queued scores until close()"""
+        self.store = open_store(path)
+        pending = self.pending
+        version = 0
+        while True:
+            self.wake.clear()
+            entries = []
+            while pending:
+                entries.append(pending.popleft())
+            self.save_scores(entries)
+            if entries or version == 0:
+                version += 1
+                self.published = (version, self.load_scores() if self.store is not None else None)
+            if self.stopping and not pending:
+                break
+            self.wake.wait()
+        if self.store is not None:
+            self.store.close()
+    
+    def refresh(self):
+        """Pick up scores published by the writer"""
+        version, scores = self.published
+        if version == self.seen:
+            return
+        self.seen = version
+        if not self.loaded:
+            # The placeholders make way for the (possibly empty) table
+            self.loaded = True
+            self.panel = None
+        if scores is not None and scores != self.scores:
+            self.scores = scores
+            self.panel = None
+    
+    def close(self):
+        """Write out every queued score and stop the writer"""
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
     
     def is_high_score(self, score):
-        """Check if a score qualifies for the top 3"""
+        """Check if a score qualifies for the top 3; nothing does until the table has loaded"""
+        self.refresh()
+        if not self.loaded:
+            return False
         if len(self.scores) < TOP_SCORES_COUNT:
             return True
         return score > self.scores[-1][1]
@@ -48,85 +126,111 @@ class HighScore:
         self.scores.append((name, score))
         self.scores.sort(key=lambda x: x[1], reverse=True)
         self.scores = self.scores[:TOP_SCORES_COUNT]
-        self.save_scores()
+        self.panel = None
+        entry = (name, score, time.time())
+        if self.thread is None:
+            self.save_scores([entry])
+        else:
+            self.pending.append(entry)
+            self.wake.set()
     
-    def get_name_input(self, screen, score):
-        """Get player name input for new high score"""
-        name = ""
-        input_active = True
+    def start_name_entry(self, score):
+        """Start the name entry screen for a new high score"""
+        return NameEntry(score)
+    
+    def draw_high_scores(self, renderer, x, y):
+        """Draw the high scores list with its title's left middle at (x, y)"""
+        self.refresh()
+        if self.panel is None:
+            self.panel = self.render_panel()
+        surface, top = self.panel
+        renderer.draw_static(surface, (x, y + top))
+    
+    def render_panel(self):
+        """Render the list once, returning the surface and its top relative to the title's middle"""
+        lines = [("HIGH SCORES", 36, (255, 215, 0), 0)]
+        
+        # Scores
+        for i, (name, score) in enumerate(self.scores):
+            lines.append((f"{i+1}. {name}: {score}", 28, (255, 255, 255), 40 + i * 25))
+        
+        # Fill remaining slots with dashes, or dots while the table is still loading
+        filler = "---: 0" if self.loaded else "..."
+        for i in range(len(self.scores), TOP_SCORES_COUNT):
+            lines.append((f"{i+1}. {filler}", 28, (128, 128, 128), 40 + i * 25))
         
-        while input_active:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return None
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN and name.strip():
-                        return name.strip()
-                    elif event.key == pygame.K_BACKSPACE:
-                        name = name[:-1]
-                    elif event.key == pygame.K_ESCAPE:
-                        return None
-                    elif len(name) < MAX_NAME_LENGTH and event.unicode.isprintable():
-                        name += event.unicode
-            
-            # Draw the input screen
-            screen.fill((0, 0, 0))
-            
-            # Draw title
-            font_large = pygame.font.SysFont(None, 72)
-            title_text = font_large.render("NEW HIGH SCORE!", True, (255, 215, 0))
-            title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 150))
-            screen.blit(title_text, title_rect)
-            
-            # Draw score
-            font_medium = pygame.font.SysFont(None, 48)
-            score_text = font_medium.render(f"Score: {score}", True, (255, 255, 255))
-            score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
-            screen.blit(score_text, score_rect)
-            
-            # Draw input prompt
-            prompt_text = font_medium.render("Enter your name:", True, (255, 255, 255))
-            prompt_rect = prompt_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
-            screen.blit(prompt_text, prompt_rect)
-            
-            # Draw input box
-            font_input = pygame.font.SysFont(None, 36)
-            input_text = font_input.render(name + "|", True, (255, 255, 255))
-            input_rect = input_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30))
-            screen.blit(input_text, input_rect)
-            
-            # Draw instructions
-            font_small = pygame.font.SysFont(None, 24)
-            instructions = [
-                "Press ENTER to save",
-                "Press ESC to cancel"
-            ]
-            for i, instruction in enumerate(instructions):
-                inst_text = font_small.render(instruction, True, (128, 128, 128))
-                inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80 + i * 25))
-                screen.blit(inst_text, inst_rect)
-            
-            pygame.display.flip()
+        rendered = [(text_renderer.render(text, size, color), y) for text, size, color, y in lines]
+        top = min(y - image.get_height() // 2 for image, y in rendered)
+        bottom = max(y - image.get_height() // 2 + image.get_height() for image, y in rendered)
+        width = max(image.get_width() for image, _ in rendered)
+        surface = pygame.Surface((width, bottom - top), pygame.SRCALPHA)
+        for image, y in rendered:
+            surface.blit(image, image.get_rect(midleft=(0, y - top)))
+        return surface, top
+
+
+class NameEntry:
+    """Name entry screen for a new high score, fed one event at a time by the main loop"""
+    
+    def __init__(self, score):
+        self.score = score
+        self.name = ""
+        self.finished = False
+        self.accepted = False
+        self.surface = None  # Cached screen, rebuilt only when the name changes
+    
+    def handle_event(self, event):
+        """Update the entry from a pygame event"""
+        if event.type != pygame.KEYDOWN or self.finished:
+            return
+        if event.key == pygame.K_RETURN and self.name.strip():
+            self.finished = True
+            self.accepted = True
+        elif event.key == pygame.K_BACKSPACE:
+            self.name = self.name[:-1]
+            self.surface = None
+        elif event.key == pygame.K_ESCAPE:
+            self.finished = True
+        elif len(self.name) < MAX_NAME_LENGTH and event.unicode and event.unicode.isprintable():
+            self.name += event.unicode
+            self.surface = None
     
-    def draw_high_scores(self, screen, x, y):
-        """Draw the high scores list"""
-        font_title = pygame.font.SysFont(None, 36)
-        font_score = pygame.font.SysFont(None, 28)
+    def result(self):
+        """Return the entered name, or None if entry was cancelled"""
+        return self.name.strip() if self.accepted else None
+    
+    def draw(self, renderer):
+        """Draw the entry screen, re-rendering it only if the name changed"""
+        if self.surface is None:
+            self.surface = self.render()
+        renderer.draw_static(self.surface, (0, 0))
+    
+    def render(self):
+        surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        surface.fill((0, 0, 0))
         
         # Draw title
-        title_text = font_title.render("HIGH SCORES", True, (255, 215, 0))
-        title_rect = title_text.get_rect(midleft=(x, y))
-        screen.blit(title_text, title_rect)
+        text_renderer.draw(surface, "NEW HIGH SCORE!", 72, (255, 215, 0),
+                           center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 150))
         
-        # Draw scores
-        for i, (name, score) in enumerate(self.scores):
-            score_text = font_score.render(f"{i+1}. {name}: {score}", True, (255, 255, 255))
-            score_rect = score_text.get_rect(midleft=(x, y + 40 + i * 25))
-            screen.blit(score_text, score_rect)
+        # Draw score
+        text_renderer.draw(surface, f"Score: {self.score}", 48, (255, 255, 255),
+                           center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
         
-        # Fill remaining slots with dashes
-        for i in range(len(self.scores), TOP_SCORES_COUNT):
-            score_text = font_score.render(f"{i+1}. ---: 0", True, (128, 128, 128))
-            score_rect = score_text.get_rect(midleft=(x, y + 40 + i * 25))
-            screen.blit(score_text, score_rect) 
\ No newline at end of file
+        # Draw input prompt
+        text_renderer.draw(surface, "Enter your name:", 48, (255, 255, 255),
+                           center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
+        
+        # Draw input box
+        text_renderer.draw(surface, self.name + "|", 36, (255, 255, 255),
+                           center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30))
+        
+        # Draw instructions
+        instructions = [
+            "Press ENTER to save",
+            "Press ESC to cancel"
+        ]
+        for i, instruction in enumerate(instructions):
+            text_renderer.draw(surface, instruction, 24, (128, 128, 128),
+                               center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80 + i * 25))
+        return surface
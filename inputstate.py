@@ -0,0 +1,43 @@
+import pygame
+
+
+# Bit order used when packing a snapshot into a byte
+BUTTONS = ('left', 'right', 'forward', 'backward', 'shoot', 'use_star')
+
+
+class InputState:
+    """Snapshot of the player controls for a single simulation step"""
+
+    def __init__(self, left=False, right=False, forward=False, backward=False,
+                 shoot=False, use_star=False):
+        self.left = left
+        self.right = right
+        self.forward = forward
+        self.backward = backward
+        self.shoot = shoot
+        self.use_star = use_star
+
+    @classmethod
+    def from_keys(cls, keys):
+        """Build a snapshot from the result of pygame.key.get_pressed()"""
+        return cls(
+            left=keys[pygame.K_a] or keys[pygame.K_LEFT],
+            right=keys[pygame.K_d] or keys[pygame.K_RIGHT],
+            forward=keys[pygame.K_w] or keys[pygame.K_UP],
+            backward=keys[pygame.K_s] or keys[pygame.K_DOWN],
+            shoot=keys[pygame.K_SPACE],
+            use_star=keys[pygame.K_e],
+        )
+
+    def to_bits(self):
+        """Pack the snapshot into an integer bit mask"""
+        bits = 0
+        for i, name in enumerate(BUTTONS):
+            if getattr(self, name):
+                bits |= 1 << i
+        return bits
+
+    @classmethod
+    def from_bits(cls, bits):
+        """Build a snapshot from a mask made by to_bits()"""
+        return cls(**{name: bool(bits & (1 << i)) for i, name in enumerate(BUTTONS)})
@@ -1,360 +1,289 @@
-import sys
+import argparse
+import time
+
+LAUNCHED = time.perf_counter()  # taken before the heavy imports, for the time to first frame
+
 import pygame
 
 from constants import *
-from player import Player
-from asteroid import Asteroid
-from asteroidfield import AsteroidField
-from shot import Shot
-from goldorb import GoldOrb
-from meteorite import Meteorite
-from star import Star
-from highscore import HighScore
-from utility_commands import UtilityCommands
-
-def init_game():
-    updatable = pygame.sprite.Group()
-    drawable = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    shots = pygame.sprite.Group()
-    orbs = pygame.sprite.Group()
-    meteorites = pygame.sprite.Group()
-    stars = pygame.sprite.Group()
-
-    Asteroid.containers = (asteroids, updatable, drawable)
-    Shot.containers = (shots, updatable, drawable)
-    GoldOrb.containers = (orbs, updatable, drawable)
-    Meteorite.containers = (meteorites, updatable, drawable)
-    Star.containers = (stars, updatable, drawable)
-    AsteroidField.containers = updatable
-    asteroid_field = AsteroidField()
-    Player.containers = (updatable, drawable)
-    player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-    return updatable, drawable, asteroids, shots, orbs, meteorites, stars, asteroid_field, player
-
-def draw_text(screen, text, size, color, x, y):
-    font = pygame.font.SysFont(None, size)
-    text_surface = font.render(text, True, color)
-    text_rect = text_surface.get_rect(center=(x, y))
-    screen.blit(text_surface, text_rect)
-
-def spawn_meteorite():
-    """Spawn a meteorite from a random edge"""
-    import random
-    edge = random.choice(['top', 'bottom', 'left', 'right'])
-    
-    if edge == 'top':
-        x = random.randint(0, SCREEN_WIDTH)
-        y = -METEORITE_RADIUS
-    elif edge == 'bottom':
-        x = random.randint(0, SCREEN_WIDTH)
-        y = SCREEN_HEIGHT + METEORITE_RADIUS
-    elif edge == 'left':
-        x = -METEORITE_RADIUS
-        y = random.randint(0, SCREEN_HEIGHT)
-    else:  # right
-        x = SCREEN_WIDTH + METEORITE_RADIUS
-        y = random.randint(0, SCREEN_HEIGHT)
-    
-    return Meteorite(x, y)
+from gameworld import GameWorld
+from inputstate import InputState
+from spritecache import sprite_cache
+from profiler import FrameProfiler
+from renderer import FullRenderer, DirtyRenderer
+from gamelog import log, DEBUG
+from scheduler import Scheduler
+from governor import QualityGovernor
+from fixedstep import FixedStepClock
+
+# Profiler phases of one main loop iteration, in order
+FRAME_PHASES = ('events', 'update', 'collisions', 'pickups', 'simulate', 'draw', 'hud', 'flip', 'idle')
+
+def seed_arg(text):
+    """--seed value; recordings store the seed as an unsigned 64-bit number"""
+    seed = int(text)
+    if not 0 <= seed < 2 ** 64:
+        raise argparse.ArgumentTypeError(f"seed must be between 0 and 2**64 - 1, not {seed}")
+    return seed
+
+def tick_rate_arg(text):
+    """--tick-rate value; the simulation needs a positive number of steps per second"""
+    rate = int(text)
+    if rate <= 0:
+        raise argparse.ArgumentTypeError(f"tick rate must be a positive number of steps per second, not {rate}")
+    return rate
+
+def draw_text(renderer, text, size, color, x, y, static=True):
+    renderer.draw_text(text, size, color, static=static, center=(x, y))
+
+
+class Countdown:
+    """'BE PREPARED', then the numbered countdown, run on a scheduler advanced only while counting down"""
 
-def main(): 
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.phase = 'prepare'  # 'prepare' or 'countdown'
+        self.finished = False
+        self.timer = scheduler.call_later(PREPARE_DISPLAY_TIME, self.start_numbers)
+
+    def start_numbers(self):
+        self.phase = 'countdown'
+        self.timer = self.scheduler.call_later(COUNTDOWN_DURATION, self.finish)
+
+    def finish(self):
+        self.finished = True
+
+    def remaining(self):
+        """Seconds left in the current phase"""
+        return self.timer.when - self.scheduler.now
+
+def make_utility(world):
+    """Utility commands for world's objects; the module is only imported once the first frame is up"""
+    from utility_commands import UtilityCommands
+    return UtilityCommands(world.game_objects())
+
+def make_high_scores():
+    """The high score table, whose module (and SQLite) is only imported once the first frame is up"""
+    from highscore import HighScore
+    return HighScore()
+
+def main(record_path=None, seed=None, profile=False, profile_dump=None, log_path=LOG_FILE, debug=False,
+         dirty_rects=False, adaptive_quality=True, tick_rate=SIMULATION_TICK_RATE, startup_only=False):
+    if debug:
+        log.set_level(DEBUG)
+    log.start(log_path)
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    renderer = DirtyRenderer(screen) if dirty_rects else FullRenderer(screen)
     clock = pygame.time.Clock()  # Set the frame rate to 60 FPS
+    sprite_cache.prerender()
     dt = 0
     
     game_state = 'countdown'  # 'countdown', 'playing', 'gameover', 'highscore_input'
-    countdown_timer = 0.0
-    countdown_phase = 'prepare'  # 'prepare' or 'countdown'
-    meteorite_spawn_timer = 0.0
-    explosion_timer = 0.0
-    explosion_position = None
-    white_circle_timer = 0.0
-    white_circle_position = None
+    countdown_timers = Scheduler()  # frame-time timers for the countdown screen
+    countdown = Countdown(countdown_timers)
+    step_clock = FixedStepClock(tick_rate)  # the world always steps by a fixed dt
+    recorded_keys = []  # utility keys waiting for the next recorded step
     
-    updatable, drawable, asteroids, shots, orbs, meteorites, stars, asteroid_field, player = init_game()
-    high_score_manager = HighScore()
+    world = GameWorld(seed)
+    recorder = None
+    if record_path:
+        # Recording covers the first game; replay it with recording.py
+        from recording import Recorder
+        recorder = Recorder(record_path, world.seed)
+    name_entry = None
+    profiler = FrameProfiler(FRAME_PHASES, dump_path=profile_dump)
+    profiler.enabled = profiler.enabled or profile
+    world.profiler = profiler
+    # A recorded game has to replay the same spawns, so the governor only degrades visuals while recording
+    governor = QualityGovernor(renderer, None if recorder else world)
+    governor.enabled = adaptive_quality
     
-    # Initialize utility commands
-    game_objects = {
-        'player': player,
-        'asteroids': asteroids,
-        'orbs': orbs,
-        'meteorites': meteorites,
-        'stars': stars,
-        'updatable': updatable,
-        'drawable': drawable
-    }
-    utility = UtilityCommands(game_objects)
-    utility.print_help()  # Print available commands on startup
+    # The countdown needs neither the utility commands nor the high score table,
+    # so both are set up after the first frame is on screen
+    utility = None
+    high_score_manager = None
 
     while True:
+        frame_start = time.perf_counter()
+        profiler.begin_frame()
+        utility_keys = []
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if recorder:
+                    recorder.close(world.checksum())
+                profiler.flush()
+                if high_score_manager is not None:
+                    high_score_manager.close()
+                if log.info_on:
+                    log.info("Simulation ticks %d, merged %d, dropped %d",
+                             step_clock.ticks, step_clock.merged_ticks, step_clock.dropped_ticks)
+                    log.info("Shape lifetimes %s", world.lifetime_stats())
+                log.stop()
                 pygame.quit()
                 return
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                # Toggle the performance overlay in any state
+                profiler.toggle()
+                continue
+            if game_state == 'highscore_input':
+                name_entry.handle_event(event)
+                if name_entry.finished:
+                    player_name = name_entry.result()
+                    if player_name:
+                        high_score_manager.add_score(player_name, world.player.points)
+                    name_entry = None
+                    game_state = 'gameover'
+                continue
             if event.type == pygame.KEYDOWN:
                 # Handle utility commands (only during playing state)
                 if game_state == 'playing':
                     utility.handle_key_press(event.key)
+                    utility_keys.append(event.key)
                 
                 # Handle game restart
                 if game_state == 'gameover' and event.key == pygame.K_r:
                     # Restart the game
-                    updatable, drawable, asteroids, shots, orbs, meteorites, stars, asteroid_field, player = init_game()
+                    if recorder:
+                        recorder.close(world.checksum())
+                        recorder = None
+                    world = GameWorld()
+                    world.profiler = profiler
+                    governor.attach(world)
                     game_state = 'countdown'
-                    countdown_timer = 0.0
-                    countdown_phase = 'prepare'
-                    meteorite_spawn_timer = 0.0
-                    explosion_timer = 0.0
-                    explosion_position = None
-                    white_circle_timer = 0.0
-                    white_circle_position = None
+                    countdown = Countdown(countdown_timers)
                     
                     # Reinitialize utility commands with new game objects
-                    game_objects = {
-                        'player': player,
-                        'asteroids': asteroids,
-                        'orbs': orbs,
-                        'meteorites': meteorites,
-                        'stars': stars,
-                        'updatable': updatable,
-                        'drawable': drawable
-                    }
-                    utility = UtilityCommands(game_objects)
+                    utility = make_utility(world)
+
+        profiler.lap('events')
 
         if game_state == 'countdown':
-            countdown_timer += dt
-            
-            if countdown_phase == 'prepare':
-                if countdown_timer >= PREPARE_DISPLAY_TIME:
-                    countdown_phase = 'countdown'
-                    countdown_timer = 0.0
-            elif countdown_phase == 'countdown':
-                if countdown_timer >= COUNTDOWN_DURATION:
-                    game_state = 'playing'
-                    countdown_timer = 0.0
+            countdown_timers.advance(dt)
+            if countdown.finished:
+                game_state = 'playing'
+                step_clock.reset()
 
         elif game_state == 'playing':
-            updatable.update(dt)
-            
-            # Update explosion effect
-            if explosion_timer > 0:
-                explosion_timer -= dt
-            
-            # Update white circle expansion effect
-            if white_circle_timer > 0:
-                white_circle_timer -= dt
-            
-            # Spawn meteorites
-            meteorite_spawn_timer += dt
-            if meteorite_spawn_timer >= METEORITE_SPAWN_RATE:
-                meteorite_spawn_timer = 0.0
-                # Only spawn meteorites if player doesn't have a star
-                if player.stars_collected == 0:
-                    new_meteorite = spawn_meteorite()
-                    meteorites.add(new_meteorite)
-                    updatable.add(new_meteorite)
-                    drawable.add(new_meteorite)
-
-            # Check player collision with asteroids
-            for asteroid in asteroids:
-                if asteroid.collides_with(player):
-                    game_state = 'gameover'
-                    # Check if this is a high score (but not in utility mode)
-                    if not utility.is_utility_mode_active() and high_score_manager.is_high_score(player.points):
-                        game_state = 'highscore_input'
+            inputs = InputState.from_keys(pygame.key.get_pressed())
+            # Star power on E is handled by utility commands while they are enabled
+            inputs.use_star = inputs.use_star and not utility.enabled
+            recorded_keys.extend(utility_keys)
+            steps = step_clock.advance(dt)
+            for i, step_dt in enumerate(steps):
+                if i == len(steps) - 1:
+                    # Frames are drawn between the states before and after the last step
+                    world.remember_positions()
+                world.step(inputs, step_dt)
+                if recorder:
+                    recorder.record(inputs, step_dt, recorded_keys)
+                recorded_keys = []
+                if world.game_over:
                     break
 
-            # Check shot collisions with asteroids
-            for shot in shots:
-                for asteroid in asteroids:
-                    if asteroid.collides_with(shot):
-                        shot.kill()
-                        # Get orbs from destroyed asteroid
-                        new_orbs = asteroid.split()
-                        if new_orbs:
-                            for orb in new_orbs:
-                                orbs.add(orb)
-                                updatable.add(orb)
-                                drawable.add(orb)
-
-            # Check shot collisions with meteorites
-            for shot in shots:
-                for meteorite in meteorites:
-                    if meteorite.collides_with(shot):
-                        shot.kill()
-                        # Create blinking star from destroyed meteorite
-                        new_star = meteorite.destroy()
-                        print(f"DEBUG: Created blinking star at {new_star.position}")
-                        stars.add(new_star)
-                        updatable.add(new_star)
-                        drawable.add(new_star)
-
-            # Check for orb collection
-            for orb in orbs:
-                if orb.animation_state == 'normal' and orb.is_collected_by(player):
-                    player.collect_orb(orb)
-                elif orb.animation_state == 'pulling' and orb.animation_timer >= ORB_PULL_DURATION:
-                    # Orb has completed pull animation, add points
-                    player.points += POINTS_PER_ORB
-                elif orb.animation_state == 'blinking' and orb.animation_timer >= ORB_BLINK_DURATION:
-                    # Orb has finished blinking, set it to pull to player
-                    orb.set_pull_target(player.position)
-                elif orb.animation_state == 'pulling' and not orb.target_position:
-                    # If an orb is in pulling state but has no target, set it
-                    orb.set_pull_target(player.position)
-                elif orb.animation_state == 'pulling' and not orb.scored:
-                    # Orb is pulling and hasn't been scored yet, award points
-                    player.points += POINTS_PER_ORB
-                    orb.scored = True
-
-            # Check for star collection
-            for star in stars:
-                if star.is_collected_by(player):
-                    print(f"DEBUG: Star collected by player")
-                    player.collect_star(star)
-
-            # Check for E key to activate star power
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_e] and player.stars_collected > 0 and not utility.enabled:
-                if player.consume_star():
-                    # Activate star power
-                    player.use_star_power()
-                    
-                    # Start explosion effect
-                    explosion_timer = STAR_EXPLOSION_DURATION
-                    explosion_position = player.position
-                    
-                    # Start white circle expansion effect
-                    white_circle_timer = STAR_CIRCLE_EXPANSION_DURATION
-                    white_circle_position = player.position
-                    
-                    # VAPORIZE ALL asteroids on screen (no distance check needed)
-                    exploded_asteroids = list(asteroids)  # Convert to list to avoid modification during iteration
-                    
-                    for asteroid in exploded_asteroids:
-                        # Create orbs from exploded asteroids using the new method
-                        new_orbs = asteroid.destroy_for_orbs()
-                        if new_orbs:
-                            for orb in new_orbs:
-                                # Start the orb with blink animation
-                                orb.start_blink_animation()
-                                orbs.add(orb)
-                                updatable.add(orb)
-                                drawable.add(orb)
-                    
-                    # Start pull animation for ALL orbs (both existing and newly created)
-                    all_orbs = list(orbs)
-                    for orb in all_orbs:
-                        if orb.animation_state == 'normal':
-                            orb.start_pull_animation(player.position)
-                        elif orb.animation_state == 'blinking':
-                            # For blinking orbs, set the target but keep them blinking
-                            orb.set_pull_target(player.position)
-                    
-                    print(f"DEBUG: Destroyed {len(exploded_asteroids)} asteroids, created orbs")
+            if world.game_over:
+                game_state = 'gameover'
+                # Check if this is a high score (but not in utility mode)
+                if not utility.is_utility_mode_active() and high_score_manager.is_high_score(world.player.points):
+                    game_state = 'highscore_input'
+                    name_entry = high_score_manager.start_name_entry(world.player.points)
 
-        elif game_state == 'highscore_input':
-            # Get player name for high score
-            player_name = high_score_manager.get_name_input(screen, player.points)
-            if player_name:
-                high_score_manager.add_score(player_name, player.points)
-            game_state = 'gameover'
+        profiler.lap('simulate')
 
-        # Fill background first
-        screen.fill((0, 0, 0))
+        renderer.begin()
+        if game_state == 'highscore_input':
+            name_entry.draw(renderer)
 
         # Draw game objects during countdown and playing states
-        if game_state in ['countdown', 'playing']:
-            for obj in drawable:
-                obj.draw(screen)
-
-        # Draw white circle expansion effect (highest priority)
-        if white_circle_timer > 0 and white_circle_position:
-            # Calculate circle radius based on time elapsed
-            progress = 1.0 - (white_circle_timer / STAR_CIRCLE_EXPANSION_DURATION)
-            
-            # Calculate the maximum radius needed to cover the entire screen
-            max_radius = max(
-                white_circle_position.distance_to(pygame.Vector2(0, 0)),
-                white_circle_position.distance_to(pygame.Vector2(SCREEN_WIDTH, 0)),
-                white_circle_position.distance_to(pygame.Vector2(0, SCREEN_HEIGHT)),
-                white_circle_position.distance_to(pygame.Vector2(SCREEN_WIDTH, SCREEN_HEIGHT))
-            )
-            
-            # Current radius based on progress
-            current_radius = max_radius * progress
-            
-            # Create a surface for the expanding circle
-            circle_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            pygame.draw.circle(circle_surface, (255, 255, 255, 255), white_circle_position, current_radius)
-            screen.blit(circle_surface, (0, 0))
-
-        # Draw explosion effect (only if circle expansion is done)
-        elif explosion_timer > 0 and explosion_position:
-            alpha = int((explosion_timer / STAR_EXPLOSION_DURATION) * 255)
-            # Create a surface for the explosion effect
-            explosion_surface = pygame.Surface((STAR_EXPLOSION_RADIUS * 2, STAR_EXPLOSION_RADIUS * 2), pygame.SRCALPHA)
-            pygame.draw.circle(explosion_surface, (255, 255, 0, alpha), (STAR_EXPLOSION_RADIUS, STAR_EXPLOSION_RADIUS), STAR_EXPLOSION_RADIUS)
-            screen.blit(explosion_surface, (explosion_position.x - STAR_EXPLOSION_RADIUS, explosion_position.y - STAR_EXPLOSION_RADIUS))
+        if game_state == 'playing':
+            renderer.draw_sprites(world.drawable, world.previous_positions, step_clock.alpha)
+        elif game_state == 'countdown':
+            renderer.draw_sprites(world.drawable)
+
+        # Star power effects
+        world.effects.draw(renderer)
+
+        profiler.lap('draw')
 
         # Draw countdown screen
         if game_state == 'countdown':
-            if countdown_phase == 'prepare':
-                draw_text(screen, 'BE PREPARED', 72, (255, 215, 0), SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-            elif countdown_phase == 'countdown':
-                remaining_time = COUNTDOWN_DURATION - countdown_timer
+            if countdown.phase == 'prepare':
+                draw_text(renderer, 'BE PREPARED', 72, (255, 215, 0), SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+            elif countdown.phase == 'countdown':
+                remaining_time = countdown.remaining()
                 countdown_number = int(remaining_time) + 1
                 if countdown_number > 0:
-                    draw_text(screen, str(countdown_number), 120, (255, 255, 255), SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+                    draw_text(renderer, str(countdown_number), 120, (255, 255, 255), SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
 
         # Display current score during gameplay
         if game_state == 'playing':
-            draw_text(screen, f'Score: {player.points}', 36, (255, 255, 255), 100, 30)
+            draw_text(renderer, f'Score: {world.player.points}', 36, (255, 255, 255), 100, 30, static=False)
             
             # Display stars collected
-            if player.stars_collected > 0:
+            if world.player.stars_collected > 0:
                 # Draw a solid yellow star icon
-                star_points = []
-                star_center = pygame.Vector2(50, 70)
-                star_radius = 15
-                for i in range(5):
-                    angle = i * 72 - 90  # Start from top
-                    outer_point = pygame.Vector2(0, -star_radius).rotate(angle)
-                    inner_point = pygame.Vector2(0, -star_radius * 0.4).rotate(angle + 36)
-                    star_points.extend([star_center + outer_point, star_center + inner_point])
-                
-                pygame.draw.polygon(screen, (255, 255, 0), star_points)
-                pygame.draw.polygon(screen, (255, 215, 0), star_points, 2)
+                icon = sprite_cache.star_icon(15)
+                renderer.draw_static(icon, icon.get_rect(center=(50, 70)).topleft)
                 
-                draw_text(screen, 'Press E to use star', 24, (255, 215, 0), 100, 100)
+                draw_text(renderer, 'Press E to use star', 24, (255, 215, 0), 100, 100)
             
             # Display high scores during gameplay
-            high_score_manager.draw_high_scores(screen, SCREEN_WIDTH - 200, 30)
+            high_score_manager.draw_high_scores(renderer, SCREEN_WIDTH - 200, 30)
             
             # Display utility status only when enabled
             if utility.enabled:
-                draw_text(screen, 'UTILITY: ENABLED', 24, (0, 255, 0), 100, SCREEN_HEIGHT - 30)
+                draw_text(renderer, 'UTILITY: ENABLED', 24, (0, 255, 0), 100, SCREEN_HEIGHT - 30)
 
         if game_state == 'gameover':
-            draw_text(screen, 'GAME OVER', 100, (255, 0, 0), SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100)
-            draw_text(screen, f'Final Score: {player.points}', 60, (255, 255, 255), SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20)
+            draw_text(renderer, 'GAME OVER', 100, (255, 0, 0), SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100)
+            draw_text(renderer, f'Final Score: {world.player.points}', 60, (255, 255, 255), SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20)
             
             # Show if it's a high score
-            if high_score_manager.is_high_score(player.points):
-                draw_text(screen, 'NEW HIGH SCORE!', 48, (255, 215, 0), SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20)
+            if high_score_manager.is_high_score(world.player.points):
+                draw_text(renderer, 'NEW HIGH SCORE!', 48, (255, 215, 0), SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20)
             
             # Display high scores
-            high_score_manager.draw_high_scores(screen, SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 80)
+            high_score_manager.draw_high_scores(renderer, SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 80)
             
-            draw_text(screen, 'Press R to Restart', 50, (255, 255, 255), SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50)
+            draw_text(renderer, 'Press R to Restart', 50, (255, 255, 255), SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50)
+
+        # Performance overlay, stacked above the utility banner
+        profiler.draw(renderer, 10, SCREEN_HEIGHT - 55)
+        profiler.lap('hud')
+
+        renderer.present()
+        profiler.lap('flip')
 
-        pygame.display.flip()
+        if profiler.first_frame is None:
+            profiler.first_frame = time.perf_counter() - LAUNCHED
+            if log.info_on:
+                log.info("First frame after %.1f ms", profiler.first_frame * 1000)
+            if startup_only:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+            utility = make_utility(world)
+            utility.print_help()  # Print available commands on startup
+            high_score_manager = make_high_scores()
 
+        governor.record(time.perf_counter() - frame_start)
         dt = clock.tick(60) /1000  # Convert milliseconds to seconds
+        profiler.lap('idle')
+        profiler.end_frame(dict(world.entity_counts(), quality=governor.level, ticks=step_clock.frame_ticks,
+                                merged_ticks=step_clock.frame_merged, dropped_ticks=step_clock.frame_dropped)
+                           if profiler.active else None)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Asteroids")
+    parser.add_argument("--seed", type=seed_arg, default=None, help="seed for the game's random spawns")
+    parser.add_argument("--record", metavar="PATH", help="record the first game's inputs for replay")
+    parser.add_argument("--profile", action="store_true", help="start with the performance overlay on (F3 toggles)")
+    parser.add_argument("--profile-dump", metavar="PATH", help="periodically write profiler data (.csv rows or .json summary)")
+    parser.add_argument("--log-file", metavar="PATH", default=LOG_FILE, help="file the game log is appended to")
+    parser.add_argument("--debug", action="store_true", help="include debug messages in the log")
+    parser.add_argument("--dirty-rects", action="store_true", help="update only the changed parts of the display each frame")
+    parser.add_argument("--fixed-quality", action="store_true", help="never reduce quality when frames run over budget")
+    parser.add_argument("--tick-rate", type=tick_rate_arg, default=SIMULATION_TICK_RATE, help="simulation steps per second")
+    parser.add_argument("--startup-only", action="store_true", help="quit as soon as the first frame is drawn")
+    args = parser.parse_args()
+    main(args.record, args.seed, args.profile, args.profile_dump, args.log_file, args.debug, args.dirty_rects,
+         not args.fixed_quality, args.tick_rate, args.startup_only)
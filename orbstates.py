@@ -0,0 +1,53 @@
+from constants import *
+
+
+class OrbStates:
+    """Gold orbs grouped by animation state, moved between groups only when their state changes
+
+    Orbs report their own state changes; the blink and pull durations run on
+    the world's scheduler, so orbs that are just drifting are never visited.
+    """
+
+    def __init__(self, scheduler, player):
+        self.scheduler = scheduler
+        self.player = player
+        # Insertion ordered dicts used as sets, so iteration order is reproducible
+        self.normal = {}  # drifting, can be picked up
+        self.blinking = {}
+        self.pulling = {}
+        self.groups = {'normal': self.normal, 'blinking': self.blinking, 'pulling': self.pulling}
+
+    def changed(self, orb):
+        """Move orb to the group for its animation_state and start that state's timers"""
+        group = self.groups[orb.animation_state]
+        if orb.state_group is not group:
+            if orb.state_group is not None:
+                del orb.state_group[orb]
+            group[orb] = None
+            orb.state_group = group
+        self.cancel(orb)
+
+        if orb.animation_state == 'blinking':
+            # Fade in halfway through the blink, then head for the player
+            orb.blink_end = self.scheduler.now + ORB_BLINK_DURATION
+            orb.timer = self.scheduler.call_later(ORB_BLINK_DURATION / 2, orb.show)
+        elif orb.animation_state == 'pulling':
+            if not orb.target_position:
+                orb.set_pull_target(self.player.position)
+            orb.pull_start = self.scheduler.now
+            # Points are awarded as soon as the pull starts
+            self.player.points += POINTS_PER_ORB * orb.value
+            orb.timer = self.scheduler.call_later(ORB_PULL_DURATION, orb.kill)
+
+    def remove(self, orb):
+        """Forget a killed orb"""
+        if orb.state_group is not None:
+            del orb.state_group[orb]
+            orb.state_group = None
+        self.cancel(orb)
+
+    def cancel(self, orb):
+        """Drop the orb's pending timer"""
+        if orb.timer is not None:
+            self.scheduler.cancel(orb.timer)
+            orb.timer = None
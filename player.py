@@ -2,47 +2,45 @@ import pygame
 
 from constants import *
 from circleshape import CircleShape
+from spritecache import sprite_cache
 from shot import Shot
+from inputstate import InputState
 
 class Player(CircleShape):
+    scheduler = None  # the world's game-time Scheduler, set in init_game
+
     def __init__(self, x, y):
         super().__init__(x, y, PLAYER_RADIUS)
         self.rotation = 0
-        self.shoot_timer = 0
+        self.ready_to_shoot_at = 0.0  # game time the shot cooldown ends
         self.points = 0  # Track player's score
         self.has_star_power = False  # Track if player has star power
         self.stars_collected = 0  # Track number of stars collected
+        self.controls = InputState()  # Set by the game world before each step
+
+    def sprite_image(self):
+        return sprite_cache.player(self.rotation)
 
-    # in the player class
-    def triangle(self):
-        forward = pygame.Vector2(0, 1).rotate(self.rotation)
-        right = pygame.Vector2(0, 1).rotate(self.rotation + 90) * self.radius / 1.5
-        a = self.position + forward * self.radius
-        b = self.position - forward * self.radius - right
-        c = self.position - forward * self.radius + right
-        return [a, b, c]
-    
     def draw(self, screen):
-        pygame.draw.polygon(screen, (0, 0, 255), self.triangle())
+        self.blit_image(screen)
 
     def update(self, dt):
-        self.shoot_timer -= dt
-        keys = pygame.key.get_pressed()
+        controls = self.controls
 
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+        if controls.left:
             self.rotate(-dt)
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+        if controls.right:
             self.rotate(dt)
-        if keys[pygame.K_w] or keys[pygame.K_UP]:
+        if controls.forward:
             self.move(dt)
-        if keys[pygame.K_s] or keys[pygame.K_DOWN]:
+        if controls.backward:
             self.move(-dt)
-        if keys[pygame.K_SPACE]:
+        if controls.shoot:
             self.shoot()
 
     def collect_orb(self, orb):
         """Collect a gold orb and add points"""
-        self.points += POINTS_PER_ORB
+        self.points += POINTS_PER_ORB * orb.value
         orb.kill()
 
     def collect_star(self, star):
@@ -63,9 +61,10 @@ class Player(CircleShape):
         self.has_star_power = False
 
     def shoot(self):
-        if self.shoot_timer > 0:
+        now = self.scheduler.now
+        if now < self.ready_to_shoot_at:
             return
-        self.shoot_timer = PLAYER_SHOOT_COOLDOWN
+        self.ready_to_shoot_at = now + PLAYER_SHOOT_COOLDOWN
         shot = Shot(self.position.x, self.position.y)
         shot.velocity = pygame.Vector2(0, 1).rotate(self.rotation) * PLAYER_SHOOT_SPEED
 
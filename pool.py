@@ -0,0 +1,44 @@
+class ObjectPool:
+    """Free list of killed shapes of one class, handed back out by CircleShape.__new__"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.free = []
+        self.retired = []  # killed this frame, not safe to reuse until recycle()
+        self.hits = 0
+        self.misses = 0
+        self.released = 0
+        self.discarded = 0
+
+    def acquire(self):
+        """Return a recycled shape, or None if the caller has to build a new one"""
+        if self.free:
+            self.hits += 1
+            return self.free.pop()
+        self.misses += 1
+        return None
+
+    def release(self, shape):
+        """Take back a killed shape; it becomes reusable after the next recycle()"""
+        shape.on_release()
+        self.retired.append(shape)
+        self.released += 1
+
+    def recycle(self):
+        """Move shapes retired since the last call onto the free list, up to max_size"""
+        room = self.max_size - len(self.free)
+        if room > 0:
+            self.free.extend(self.retired[:room])
+        self.discarded += max(0, len(self.retired) - max(room, 0))
+        self.retired.clear()
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'released': self.released,
+            'discarded': self.discarded,
+            'free': len(self.free),
+        }
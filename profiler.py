@@ -0,0 +1,161 @@
+import sys
+import time
+from collections import deque
+
+from constants import *
+
+# Upper edges (ms) of the frame time histogram buckets; the last bucket is open ended
+HISTOGRAM_EDGES_MS = (4, 8, 16.7, 33.3)
+
+
+class FrameProfiler:
+    """Per-phase frame timings, entity counts and allocations over a rolling window
+
+    Phases are timed as laps: lap(name) charges the time since the previous lap
+    to name. Every call returns straight away while the profiler is disabled.
+    """
+
+    def __init__(self, phases=(), history=PROFILER_HISTORY_FRAMES, dump_path=None,
+                 dump_interval=PROFILER_DUMP_INTERVAL):
+        self.enabled = dump_path is not None
+        self.active = False  # enabled state latched at the start of the frame
+        self.history = deque(maxlen=history)
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.last_dump = time.perf_counter()
+        self.pending_rows = []  # frames not yet written to a CSV dump
+        self.csv_columns = None
+        # Every phase seen so far in first-seen order; declaring them up front
+        # keeps overlay order and CSV columns stable
+        self.phase_names = dict.fromkeys(phases, True)
+        self.overlay_lines = []
+        self.overlay_updated = 0.0
+        self.first_frame = None  # seconds from launch to the first presented frame
+
+    def toggle(self):
+        self.enabled = not self.enabled
+
+    def begin_frame(self):
+        self.active = self.enabled
+        if not self.active:
+            return
+        now = time.perf_counter()
+        self.frame_start = now
+        self.last_lap = now
+        self.phases = {}
+        self.blocks = sys.getallocatedblocks()
+
+    def lap(self, name):
+        """Charge the time since the previous lap to the named phase"""
+        if not self.active:
+            return
+        now = time.perf_counter()
+        if name not in self.phase_names:
+            self.phase_names[name] = True
+        self.phases[name] = self.phases.get(name, 0.0) + now - self.last_lap
+        self.last_lap = now
+
+    def end_frame(self, counts=None, idle_phase='idle'):
+        """Finish the frame; time spent in idle_phase is excluded from the busy time"""
+        if not self.active:
+            return
+        now = time.perf_counter()
+        record = {name: seconds * 1000 for name, seconds in self.phases.items()}
+        record['frame'] = (now - self.frame_start) * 1000
+        record['busy'] = record['frame'] - record.get(idle_phase, 0.0)
+        record['alloc_blocks'] = sys.getallocatedblocks() - self.blocks
+        if counts:
+            record.update(counts)
+        self.history.append(record)
+        if self.dump_path and self.dump_path.endswith('.csv'):
+            self.pending_rows.append(record)
+
+        if now - self.overlay_updated >= PROFILER_OVERLAY_REFRESH:
+            self.overlay_lines = self.format_overlay()
+            self.overlay_updated = now
+        if self.dump_path and now - self.last_dump >= self.dump_interval:
+            self.dump()
+            self.last_dump = now
+
+    def histogram(self):
+        """Count busy frame times in the window per HISTOGRAM_EDGES_MS bucket"""
+        buckets = [0] * (len(HISTOGRAM_EDGES_MS) + 1)
+        for record in self.history:
+            busy = record['busy']
+            for i, edge in enumerate(HISTOGRAM_EDGES_MS):
+                if busy < edge:
+                    buckets[i] += 1
+                    break
+            else:
+                buckets[-1] += 1
+        return buckets
+
+    def summary(self):
+        """Mean and p95 for every recorded field over the rolling window"""
+        fields = {}
+        for record in self.history:
+            for name, value in record.items():
+                fields.setdefault(name, []).append(value)
+        result = {}
+        for name, values in fields.items():
+            ordered = sorted(values)
+            result[name] = {
+                'mean': sum(values) / len(values),
+                'p95': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+            }
+        return result
+
+    def format_overlay(self):
+        summary = self.summary()
+        lines = []
+        for name in self.phase_names:
+            if name in summary:
+                stats = summary[name]
+                lines.append(f"{name}: {stats['mean']:.2f} ms (p95 {stats['p95']:.2f})")
+        busy = summary['busy']
+        lines.append(f"busy: {busy['mean']:.2f} ms (p95 {busy['p95']:.2f})  alloc: {summary['alloc_blocks']['mean']:+.0f}")
+        counts = [f"{name} {int(stats['mean'])}" for name, stats in summary.items()
+                  if name not in self.phase_names and name not in ('frame', 'busy', 'alloc_blocks')]
+        if counts:
+            lines.append(" ".join(counts))
+        lines.append("hist " + " ".join(str(count) for count in self.histogram()))
+        return lines
+
+    def draw(self, renderer, x, y):
+        """Draw the overlay upwards from (x, y)"""
+        if not self.enabled:
+            return
+        for i, line in enumerate(reversed(self.overlay_lines)):
+            renderer.draw_text(line, 20, (0, 255, 255), static=True, midleft=(x, y - i * 18))
+
+    def flush(self):
+        """Write any outstanding data to the dump file"""
+        if self.dump_path:
+            self.dump()
+
+    def dump(self):
+        """Append new frames as CSV rows, or write a JSON summary, depending on the file extension"""
+        # The writers are imported on first dump, keeping them off the startup path
+        if self.dump_path.endswith('.csv'):
+            import csv
+            rows = self.pending_rows
+            if not rows:
+                return
+            if self.csv_columns is None:
+                fields = {name for row in rows for name in row} | set(self.phase_names)
+                self.csv_columns = sorted(fields)
+                mode = 'w'
+            else:
+                mode = 'a'
+            with open(self.dump_path, mode, newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=self.csv_columns, restval='', extrasaction='ignore')
+                if mode == 'w':
+                    writer.writeheader()
+                writer.writerows(rows)
+            self.pending_rows = []
+        else:
+            import json
+            first_frame_ms = self.first_frame * 1000 if self.first_frame is not None else None
+            with open(self.dump_path, 'w') as f:
+                json.dump({'summary': self.summary(), 'histogram_edges_ms': HISTOGRAM_EDGES_MS,
+                           'histogram': self.histogram(), 'first_frame_ms': first_frame_ms}, f, indent=2)
@@ -0,0 +1,108 @@
+import argparse
+import struct
+import time
+
+from gameworld import GameWorld
+from inputstate import InputState
+from utility_commands import UtilityCommands
+
+# File layout: header, then one frame record (plus its utility keys) per world step
+MAGIC = b"ASTREC02"
+HEADER = struct.Struct("<8sQI")  # magic, seed, checksum of the final world state (0 if unknown)
+FRAME = struct.Struct("<dBB")  # dt, input bits, utility key count
+KEY = struct.Struct("<I")  # pygame key code
+
+
+class Recorder:
+    """Writes the seed and every step's input snapshot and dt to a compact binary file"""
+
+    def __init__(self, path, seed):
+        self.file = open(path, 'wb')
+        self.seed = seed
+        self.file.write(HEADER.pack(MAGIC, seed, 0))
+        self.frames = 0
+
+    def record(self, inputs, dt, utility_keys=()):
+        """Record one world step, with the utility keys handled just before it"""
+        self.file.write(FRAME.pack(dt, inputs.to_bits(), len(utility_keys)))
+        for key in utility_keys:
+            self.file.write(KEY.pack(key))
+        self.frames += 1
+
+    def close(self, checksum=0):
+        """Finish the file, storing the world's checksum after the last recorded step"""
+        if not self.file.closed:
+            self.file.seek(0)
+            self.file.write(HEADER.pack(MAGIC, self.seed, checksum))
+            self.file.close()
+
+
+def load_recording(path):
+    """Return (seed, checksum, frames) where each frame is (inputs, dt, utility_keys)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a game recording")
+    magic, seed, checksum = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a game recording")
+
+    frames = []
+    offset = HEADER.size
+    while offset + FRAME.size <= len(data):
+        dt, bits, key_count = FRAME.unpack_from(data, offset)
+        offset += FRAME.size
+        keys = [KEY.unpack_from(data, offset + i * KEY.size)[0] for i in range(key_count)]
+        offset += key_count * KEY.size
+        frames.append((InputState.from_bits(bits), dt, keys))
+    return seed, checksum, frames
+
+def replay(path, use_entity_store=False):
+    """Re-run a recording as fast as possible and return per-frame timings
+
+    'matches' is whether the replay ended in the recorded state, or None when
+    the recording has no checksum.
+    """
+    seed, recorded, frames = load_recording(path)
+    world = GameWorld(seed, use_entity_store)
+    utility = UtilityCommands(world.game_objects())
+
+    frame_times = []
+    start = time.perf_counter()
+    for inputs, dt, keys in frames:
+        frame_start = time.perf_counter()
+        for key in keys:
+            utility.handle_key_press(key)
+        world.step(inputs, dt)
+        frame_times.append(time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+    checksum = world.checksum()
+
+    return {
+        'seed': seed,
+        'frames': len(frames),
+        'elapsed': elapsed,
+        'slowest_frame': max(frame_times, default=0.0),
+        'score': world.player.points,
+        'game_over': world.game_over,
+        'checksum': checksum,
+        'matches': checksum == recorded if recorded else None,
+        'frame_times': frame_times,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded game at maximum speed")
+    parser.add_argument("path")
+    parser.add_argument("--entity-store", action="store_true", help="move entities with the NumPy entity store")
+    args = parser.parse_args()
+
+    result = replay(args.path, args.entity_store)
+    frame_times = result.pop('frame_times')
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    slowest = sorted(range(len(frame_times)), key=frame_times.__getitem__, reverse=True)[:5]
+    print("slowest frames: " + ", ".join(f"{i} ({frame_times[i] * 1000:.2f} ms)" for i in slowest))
+
+
+if __name__ == "__main__":
+    main()
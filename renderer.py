@@ -0,0 +1,204 @@
+import pygame
+from constants import *
+from spritecache import draw_sprites, sprite_blits
+from textcache import text_renderer
+
+
+class FullRenderer:
+    """Clears the whole screen, draws straight onto it and flips the display every frame"""
+
+    def __init__(self, screen, background=(0, 0, 0)):
+        self.screen = screen
+        self.background = background
+        # Reused for translucent shapes instead of allocating an alpha surface per draw
+        self.overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        self.low_res = None  # smaller overlay for translucent shapes at reduced quality
+
+    def set_effect_scale(self, scale):
+        """Draw translucent shapes at scale times the screen resolution (1 for full)"""
+        if scale >= 1:
+            self.low_res = None
+        else:
+            width, height = self.screen.get_size()
+            self.low_res = pygame.Surface((max(1, int(width * scale)), max(1, int(height * scale))), pygame.SRCALPHA)
+
+    def begin(self):
+        self.screen.fill(self.background)
+
+    def draw_sprites(self, sprites, previous=None, alpha=1.0):
+        """Draw sprites, interpolated from their previous positions if given (see sprite_blits)"""
+        draw_sprites(self.screen, sprites, previous, alpha)
+
+    def blit(self, surface, dest):
+        """Draw something that may change every frame"""
+        self.screen.blit(surface, dest)
+
+    def draw_static(self, surface, dest):
+        """Draw something that usually looks the same and stays in place from frame to frame"""
+        self.screen.blit(surface, dest)
+
+    def draw_circle(self, color, center, radius, alpha=255):
+        """Draw a filled circle, blended with the given alpha"""
+        draw_circle(self.screen, self.overlay, color, center, radius, alpha, self.low_res)
+
+    def draw_text(self, text, size, color, static=False, **rect_kwargs):
+        """Draw cached text positioned by a Rect keyword, e.g. center=(x, y)"""
+        surface = text_renderer.render(text, size, color)
+        rect = surface.get_rect(**rect_kwargs)
+        if static:
+            self.draw_static(surface, rect.topleft)
+        else:
+            self.blit(surface, rect.topleft)
+        return rect
+
+    def present(self):
+        pygame.display.flip()
+
+
+def draw_circle(screen, overlay, color, center, radius, alpha, low_res=None):
+    """Draw a filled circle, blending translucent ones through the reusable overlay
+
+    With a low_res overlay, translucent circles are drawn on it and scaled up
+    into the overlay, trading edge quality for fill time.
+    """
+    if alpha >= 255:
+        pygame.draw.circle(screen, color, center, radius)
+        return
+    area = circle_bounds(center, radius).clip(overlay.get_rect())
+    if not area:
+        return
+    rgba = (color[0], color[1], color[2], alpha)
+    if low_res is None:
+        overlay.fill((0, 0, 0, 0), area)
+        pygame.draw.circle(overlay, rgba, center, radius)
+    else:
+        scale = low_res.get_width() / overlay.get_width()
+        small = pygame.Rect(int(area.x * scale), int(area.y * scale),
+                            int(area.width * scale) + 1, int(area.height * scale) + 1).clip(low_res.get_rect())
+        if not small:
+            return
+        low_res.fill((0, 0, 0, 0), small)
+        pygame.draw.circle(low_res, rgba, (center[0] * scale, center[1] * scale), radius * scale)
+        pygame.transform.scale(low_res.subsurface(small), area.size, overlay.subsurface(area))
+    screen.blit(overlay, area, area)
+
+def circle_bounds(center, radius):
+    return pygame.Rect(center[0] - radius - 1, center[1] - radius - 1, 2 * radius + 2, 2 * radius + 2)
+
+def bounds(surface, dest):
+    """Rect covering surface blitted at dest, with a pixel of slack for fractional positions"""
+    return pygame.Rect(dest[0] - 1, dest[1] - 1, surface.get_width() + 2, surface.get_height() + 2)
+
+
+class DirtyRenderer(FullRenderer):
+    """Redraws and updates only the screen regions that changed since the last frame
+
+    Draw calls are queued until present(); ops with no surface carry a
+    function that draws them onto the screen. It then clears what was drawn last
+    frame, draws this frame's sprites and changing items, redraws static items
+    only if they are new, moved, or something was drawn or cleared over them,
+    and passes the touched rects to display.update(). A full flip is used
+    instead when the touched area passes full_update_fraction of the screen.
+    """
+
+    def __init__(self, screen, background=(0, 0, 0), full_update_fraction=DIRTY_RECT_FULL_UPDATE_FRACTION):
+        super().__init__(screen, background)
+        self.screen_rect = screen.get_rect()
+        self.max_dirty_area = full_update_fraction * self.screen_rect.width * self.screen_rect.height
+        # Clearing is one batched blit of background patches rather than a fill per rect
+        self.backdrop = pygame.Surface(self.screen_rect.size).convert(screen)
+        self.backdrop.fill(background)
+        self.ops = []  # (surface, dest, rect, static) in draw order
+        self.fallback = []  # sprites without a sprite_image, drawn with their own draw()
+        self.drawn = []  # changing rects drawn last frame, cleared next frame
+        self.statics = {}  # rect -> surface of static items on screen
+        self.full = True  # the first frame is drawn and flipped in full
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def invalidate(self):
+        """Redraw and flip the whole screen on the next present()"""
+        self.full = True
+
+    def begin(self):
+        self.ops = []
+        self.fallback = []
+
+    def draw_sprites(self, sprites, previous=None, alpha=1.0):
+        ops = self.ops
+        for image, dest in sprite_blits(sprites, self.fallback, previous, alpha):
+            ops.append((image, dest, bounds(image, dest), False))
+
+    def blit(self, surface, dest):
+        self.ops.append((surface, dest, bounds(surface, dest), False))
+
+    def draw_static(self, surface, dest):
+        self.ops.append((surface, dest, bounds(surface, dest), True))
+
+    def draw_circle(self, color, center, radius, alpha=255):
+        center = (center[0], center[1])
+        overlay = self.overlay
+        low_res = self.low_res
+        def draw(screen):
+            draw_circle(screen, overlay, color, center, radius, alpha, low_res)
+        self.ops.append((None, draw, circle_bounds(center, radius), False))
+
+    def present(self):
+        screen = self.screen
+        screen_rect = self.screen_rect
+        ops = self.ops
+        full = self.full or bool(self.fallback)
+
+        drawn = [rect.clip(screen_rect) for _, _, rect, static in ops if not static]
+        statics = {tuple(rect): surface for surface, _, rect, static in ops if static}
+        kept = set()  # indices of static ops still on screen from an earlier frame
+        if full:
+            screen.fill(self.background)
+            cleared = []
+        else:
+            # Clear last frame's changing items and any static item that has gone or changed
+            cleared = self.drawn + [pygame.Rect(key) for key, surface in self.statics.items()
+                                    if statics.get(key) is not surface]
+            kept = {i for i, (surface, _, rect, static) in enumerate(ops)
+                    if static and self.statics.get(tuple(rect)) is surface and rect.collidelist(drawn) == -1}
+            # Statics that get redrawn are cleared first so blending doesn't build up,
+            # which can in turn uncover other statics
+            cleared.extend(rect for i, (_, _, rect, static) in enumerate(ops) if static and i not in kept)
+            while True:
+                touched = [i for i in kept if ops[i][2].collidelist(cleared) != -1]
+                if not touched:
+                    break
+                for i in touched:
+                    kept.discard(i)
+                    cleared.append(ops[i][2])
+            backdrop = self.backdrop
+            screen.blits([(backdrop, rect, rect) for rect in cleared], doreturn=False)
+
+        dirty = cleared + drawn
+        batch = []
+        for i, (surface, dest, _, _) in enumerate(ops):
+            if i in kept:
+                continue
+            if surface is None:
+                # Keep draw order: flush queued blits before a drawn op
+                if batch:
+                    screen.blits(batch, doreturn=False)
+                    batch = []
+                dest(screen)
+            else:
+                batch.append((surface, dest))
+        if batch:
+            screen.blits(batch, doreturn=False)
+        for sprite in self.fallback:
+            sprite.draw(screen)
+
+        self.drawn = drawn
+        self.statics = statics
+        # Fallback sprites' extents are unknown, so the next frame is drawn in full too
+        self.full = bool(self.fallback)
+        if full or sum(rect.width * rect.height for rect in dirty) > self.max_dirty_area:
+            pygame.display.flip()
+            self.full_updates += 1
+        else:
+            pygame.display.update(dirty)
+            self.partial_updates += 1
@@ -0,0 +1,157 @@
+import heapq
+import itertools
+from constants import *
+
+
+class Timer:
+    """Handle for a scheduled call, used to cancel it or change its interval"""
+
+    __slots__ = ('when', 'sequence', 'callback', 'args', 'interval', 'cancelled')
+
+    def __init__(self, when, sequence, callback, args, interval=None):
+        self.when = when
+        self.sequence = sequence  # keeps same-time timers in scheduling order
+        self.callback = callback
+        self.args = args
+        self.interval = interval  # seconds between calls for repeating timers
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.when, self.sequence) < (other.when, other.sequence)
+
+
+class Scheduler:
+    """Hierarchical timer wheel running callbacks at points in game time
+
+    Time is cut into ticks of resolution seconds. Level 0 has one slot per
+    tick for the next `slots` ticks, and every further level has slots
+    `slots` times as wide. A timer sits in the narrowest level that reaches
+    it and drops to a lower level when the clock gets close. Advancing the
+    clock only visits the slots it passes, so its cost follows the number of
+    timers that fire, not the number waiting. Timers due in the same advance
+    fire in (when, scheduling order), exactly as a sorted queue would.
+    """
+
+    def __init__(self, resolution=TIMER_WHEEL_RESOLUTION, slots=TIMER_WHEEL_SLOTS, levels=TIMER_WHEEL_LEVELS):
+        self.now = 0.0
+        self.resolution = resolution
+        self.bits = slots.bit_length() - 1
+        if 1 << self.bits != slots:
+            raise ValueError("slots must be a power of two")
+        self.mask = slots - 1
+        self.wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.overflow = []  # timers beyond the top level
+        self.tick = 0  # tick the clock is in; earlier ticks' slots are empty
+        self.pending = 0
+        self.sequence = itertools.count()
+        self.due = None  # heap of timers firing in the current advance
+
+    def __len__(self):
+        return self.pending
+
+    def call_at(self, when, callback, *args):
+        """Call callback(*args) once the clock reaches when"""
+        timer = Timer(when, next(self.sequence), callback, args)
+        self.place(timer)
+        self.pending += 1
+        return timer
+
+    def call_later(self, delay, callback, *args):
+        """Call callback(*args) after delay seconds of game time"""
+        return self.call_at(self.now + delay, callback, *args)
+
+    def call_every(self, interval, callback, *args, first=None):
+        """Call callback(*args) every interval seconds, first after `first` seconds (default interval)"""
+        when = self.now + (interval if first is None else first)
+        timer = Timer(when, next(self.sequence), callback, args, interval)
+        self.place(timer)
+        self.pending += 1
+        return timer
+
+    def cancel(self, timer):
+        if timer is not None and not timer.cancelled:
+            timer.cancelled = True
+            self.pending -= 1
+
+    def set_interval(self, timer, interval):
+        """Change a repeating timer's interval, counted from its last call; returns the new handle"""
+        last = timer.when - timer.interval
+        self.cancel(timer)
+        return self.call_every(interval, timer.callback, *timer.args, first=max(last + interval - self.now, 0.0))
+
+    def place(self, timer):
+        if self.due is not None and timer.when <= self.now:
+            # Scheduled by a callback and already due: fire it in order within this advance
+            heapq.heappush(self.due, timer)
+            return
+        tick = int(timer.when / self.resolution)
+        delta = tick - self.tick
+        if delta < 0:
+            # Already due: the current slot is checked against the clock
+            tick, delta = self.tick, 0
+        bits = self.bits
+        for level, wheel in enumerate(self.wheels):
+            if delta >> (bits * (level + 1)) == 0:
+                wheel[(tick >> (bits * level)) & self.mask].append(timer)
+                return
+        self.overflow.append(timer)
+
+    def cascade(self):
+        """Move timers from wider slots down as the clock enters them"""
+        bits = self.bits
+        for level in range(1, len(self.wheels)):
+            if self.tick & ((1 << (bits * level)) - 1):
+                return
+            slot = self.wheels[level][(self.tick >> (bits * level)) & self.mask]
+            timers = slot[:]
+            slot.clear()
+            for timer in timers:
+                self.place(timer)
+        if self.tick & ((1 << (bits * len(self.wheels))) - 1) == 0:
+            timers = self.overflow
+            self.overflow = []
+            for timer in timers:
+                self.place(timer)
+
+    def advance(self, dt):
+        """Move the clock forward and run every timer that has come due"""
+        self.now += dt
+        now = self.now
+        target = int(now / self.resolution)
+        level0 = self.wheels[0]
+        mask = self.mask
+        due = []
+        while True:
+            slot = level0[self.tick & mask]
+            if slot:
+                if self.tick < target:
+                    due.extend(slot)
+                    slot.clear()
+                else:
+                    due.extend(timer for timer in slot if timer.when <= now)
+                    slot[:] = [timer for timer in slot if timer.when > now]
+            if self.tick >= target:
+                break
+            self.tick += 1
+            self.cascade()
+        if not due:
+            return
+        # Repeating timers that come due again, and timers callbacks schedule for
+        # now or earlier, go back on the heap so everything fires in order
+        heapq.heapify(due)
+        self.due = due
+        try:
+            while due:
+                timer = heapq.heappop(due)
+                if timer.cancelled:
+                    continue
+                if timer.interval is None:
+                    timer.cancelled = True
+                    self.pending -= 1
+                else:
+                    timer.when += timer.interval
+                    timer.sequence = next(self.sequence)
+                    self.place(timer)
+                timer.callback(*timer.args)
+        finally:
+            self.due = None
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import time
+
+from constants import *
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_by_player ON scores (name, score DESC);
+"""
+
+
+class ScoreStore:
+    """Every score ever entered, kept in an SQLite database
+
+    Each write is a single transaction in write-ahead-log mode, so a crash
+    leaves either the old table or the new one, never a half-written file.
+    The score index serves top-K and rank queries and the (name, score) index
+    serves per-player bests without scanning the history. Ties rank in the
+    order the scores were entered.
+    """
+
+    def __init__(self, path=HIGH_SCORE_DB, legacy_path=HIGH_SCORE_FILE):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        with self.db:
+            self.db.executescript(SCHEMA)
+        if legacy_path and self.count() == 0 and os.path.exists(legacy_path):
+            self.import_legacy(legacy_path)
+
+    def close(self):
+        self.db.close()
+
+    def add(self, name, score, created=None):
+        """Record a score, returning its id"""
+        with self.db:
+            cursor = self.db.execute("INSERT INTO scores (name, score, created) VALUES (?, ?, ?)",
+                                     (name, score, time.time() if created is None else created))
+        return cursor.lastrowid
+
+    def add_many(self, entries):
+        """Record (name, score, created) entries in one transaction"""
+        with self.db:
+            self.db.executemany("INSERT INTO scores (name, score, created) VALUES (?, ?, ?)", entries)
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def top(self, k):
+        """Return the k best (name, score) pairs, highest first"""
+        return self.db.execute("SELECT name, score FROM scores ORDER BY score DESC, id LIMIT ?", (k,)).fetchall()
+
+    def rank(self, score):
+        """Rank a new score would get (1 is best); it goes behind equal scores already stored
+
+        Counted on the score index, so the cost follows the number of better scores.
+        """
+        return self.db.execute("SELECT COUNT(*) FROM scores WHERE score >= ?", (score,)).fetchone()[0] + 1
+
+    def best(self, name):
+        """Return (score, created) of the player's best score, or None"""
+        return self.db.execute("SELECT score, created FROM scores WHERE name = ? ORDER BY score DESC LIMIT 1",
+                               (name,)).fetchone()
+
+    def bests(self, k):
+        """Return the k best players as (name, best score), highest first"""
+        return self.db.execute("SELECT name, MAX(score) AS best FROM scores GROUP BY name "
+                               "ORDER BY best DESC LIMIT ?", (k,)).fetchall()
+
+    def history(self, name=None, limit=None):
+        """Return (name, score, created) entries, newest first, optionally for one player"""
+        query = "SELECT name, score, created FROM scores"
+        params = []
+        if name is not None:
+            query += " WHERE name = ?"
+            params.append(name)
+        query += " ORDER BY id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.db.execute(query, params).fetchall()
+
+    def import_legacy(self, path):
+        """Copy scores from the old name,score text file, dated by the file's modification time"""
+        created = os.path.getmtime(path)
+        entries = []
+        with open(path, 'r') as f:
+            for line in f:
+                parts = line.strip().split(',')
+                if len(parts) == 2 and parts[1].strip().lstrip('-').isdigit():
+                    entries.append((parts[0], int(parts[1]), created))
+        # Keep the file's order among equal scores
+        entries.sort(key=lambda entry: entry[1], reverse=True)
+        self.add_many(entries)
@@ -1,14 +1,24 @@
-import pygame
 from constants import *
 from circleshape import CircleShape
+from spritecache import sprite_cache
 
 
 class Shot(CircleShape):
+    offscreen_margin = SHOT_RADIUS
+    max_age = SHOT_MAX_AGE
+    max_count = SHOT_MAX_COUNT
+
     def __init__(self, x, y):
         super().__init__(x, y, SHOT_RADIUS)
 
+    def sprite_image(self):
+        return sprite_cache.shot()
+
     def draw(self, screen):
-        pygame.draw.circle(screen, (255, 0, 0), self.position, self.radius)
+        self.blit_image(screen)
 
     def update(self, dt):
-        self.position += self.velocity * dt
\ No newline at end of file
+        if self.slot is not None:
+            return  # moved and culled in bulk by the entity store
+        self.position += self.velocity * dt
+        self.update_lifetime(dt)
@@ -0,0 +1,112 @@
+from constants import *
+from circleshape import sweep_fraction
+
+
+class SpatialGrid:
+    """Uniform grid broad phase for circle shapes"""
+
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        """Remove every shape from the grid"""
+        self.cells.clear()
+
+    def cell_range(self, position, radius):
+        """Return the (min_x, max_x, min_y, max_y) cells covered by a circle"""
+        size = self.cell_size
+        return (
+            int((position.x - radius) // size),
+            int((position.x + radius) // size),
+            int((position.y - radius) // size),
+            int((position.y + radius) // size),
+        )
+
+    def insert(self, shape, dt=0.0):
+        """Add a shape to every cell its bounding box touches, over the last step of dt if given"""
+        if dt:
+            self.insert_cells(shape, *self.cell_range(*shape.swept_bounds(dt)))
+        else:
+            self.insert_cells(shape, *self.cell_range(shape.position, shape.radius))
+
+    def insert_cells(self, shape, min_x, max_x, min_y, max_y):
+        """Add a shape to every cell in an inclusive cell range"""
+        cells = self.cells
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [shape]
+                else:
+                    bucket.append(shape)
+
+    def rebuild(self, shapes, dt=0.0):
+        """Clear the grid and insert all of the given shapes, swept over the last step of dt if given"""
+        self.cells.clear()
+        for shape in shapes:
+            self.insert(shape, dt)
+
+    def rebuild_store(self, store, dt=0.0):
+        """Clear the grid and insert every owner of an EntityStore, with the cell ranges worked out in bulk"""
+        self.cells.clear()
+        for owner, cell_range in zip(store.owners, store.cell_ranges(self.cell_size, dt)):
+            self.insert_cells(owner, *cell_range)
+
+    def query(self, position, radius):
+        """Return the unique shapes sharing a cell with the given circle"""
+        return self.query_cells(*self.cell_range(position, radius))
+
+    def query_cells(self, min_x, max_x, min_y, max_y):
+        """Return the unique shapes in an inclusive cell range"""
+        cells = self.cells
+        if min_x == max_x and min_y == max_y:
+            return list(cells.get((min_x, min_y), ()))
+
+        found = []
+        seen = set()
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                for shape in cells.get((cx, cy), ()):
+                    if id(shape) not in seen:
+                        seen.add(id(shape))
+                        found.append(shape)
+        return found
+
+    def colliding(self, shape):
+        """Return live shapes in the grid that actually overlap the given shape"""
+        return [
+            other for other in self.query(shape.position, shape.radius)
+            if other.alive() and other.collides_with(shape)
+        ]
+
+    def sweeping(self, shape, dt):
+        """Return (time of impact, other) for live shapes in the grid that the shape touched during
+        the last step of dt, earliest first; the grid must have been rebuilt with the same dt"""
+        # Both shapes move in straight lines for min(dt, age) seconds; the shape's own terms are hoisted
+        own_time = shape.travel_time(dt)
+        x, y = shape.position
+        move_x, move_y = shape.velocity * own_time
+        radius = shape.radius
+        hits = []
+        for other in self.query(*shape.swept_bounds(dt)):
+            if other.alive():
+                other_time = min(dt, other.age)
+                other_velocity = other.velocity
+                other_position = other.position
+                relative_x = move_x - other_velocity.x * other_time
+                relative_y = move_y - other_velocity.y * other_time
+                t = sweep_fraction(x - other_position.x - relative_x, y - other_position.y - relative_y,
+                                   relative_x, relative_y, radius + other.radius)
+                if t is not None:
+                    hits.append((t, other))
+        if len(hits) > 1:
+            hits.sort(key=lambda hit: hit[0])
+        return hits
+
+    def within(self, position, distance):
+        """Return live shapes whose centre is within distance of position"""
+        return [
+            other for other in self.query(position, distance)
+            if other.alive() and other.position.distance_to(position) <= distance
+        ]
@@ -0,0 +1,185 @@
+import math
+import pygame
+from constants import *
+
+
+class SpriteCache:
+    """Pre-rendered entity surfaces, drawn once and blitted every frame"""
+
+    def __init__(self):
+        self.images = {}
+        self.detailed = True  # False swaps in single-layer sprites to save fill time
+
+    def set_detail(self, detailed):
+        self.detailed = detailed
+
+    def get(self, key, builder):
+        """Return the surface for key, building it on first use"""
+        image = self.images.get(key)
+        if image is None:
+            image = builder()
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            self.images[key] = image
+        return image
+
+    def clear(self):
+        self.images.clear()
+
+    def asteroid(self, radius):
+        return self.get(('asteroid', radius), lambda: circle_image(radius, [((255, 255, 255), radius)]))
+
+    def shot(self):
+        return self.get(('shot',), lambda: circle_image(SHOT_RADIUS, [((255, 0, 0), SHOT_RADIUS)]))
+
+    def orb(self, value=1):
+        """A single orb, or a cluster of particles for an orb standing in for value orbs"""
+        if value > 1:
+            particles = min(value, ORB_CLUSTER_MAX_PARTICLES)
+            return self.get(('orb_cluster', particles, self.detailed),
+                            lambda: orb_cluster_image(particles, self.detailed))
+        if not self.detailed:
+            return self.get(('orb', 'simple'), lambda: circle_image(GOLD_ORB_RADIUS, [((255, 215, 0), GOLD_ORB_RADIUS)]))
+        return self.get(('orb',), lambda: circle_image(GOLD_ORB_RADIUS, [
+            ((255, 215, 0), GOLD_ORB_RADIUS),
+            ((255, 255, 0), GOLD_ORB_RADIUS - 2),
+        ]))
+
+    def meteorite(self):
+        if not self.detailed:
+            return self.get(('meteorite', 'simple'),
+                            lambda: circle_image(METEORITE_RADIUS, [((64, 64, 64), METEORITE_RADIUS)]))
+        return self.get(('meteorite',), lambda: circle_image(METEORITE_RADIUS, [
+            ((64, 64, 64), METEORITE_RADIUS),
+            ((128, 128, 128), METEORITE_RADIUS - 3),
+        ]))
+
+    def star(self, radius=STAR_RADIUS):
+        if not self.detailed:
+            return self.star_icon(radius)
+        return self.get(('star', radius), lambda: star_image(radius))
+
+    def star_icon(self, radius):
+        """Star for the HUD, without the debug dot"""
+        return self.get(('star_icon', radius), lambda: star_image(radius, debug_dot=False))
+
+    def player(self, rotation):
+        step = round(rotation / PLAYER_ROTATION_STEP) % int(360 / PLAYER_ROTATION_STEP)
+        return self.get(('player', step), lambda: player_image(step * PLAYER_ROTATION_STEP))
+
+    def prerender(self):
+        """Warm the cache with every sprite the game can draw"""
+        for kind in range(1, ASTEROID_KINDS + 1):
+            self.asteroid(ASTEROID_MIN_RADIUS * kind)
+        self.shot()
+        # Both detail levels, so the quality governor can switch without a hitch
+        previous = self.detailed
+        for detailed in (True, False):
+            self.set_detail(detailed)
+            self.orb()
+            self.meteorite()
+            self.star()
+        self.set_detail(previous)
+        for step in range(int(360 / PLAYER_ROTATION_STEP)):
+            self.player(step * PLAYER_ROTATION_STEP)
+
+
+def circle_image(radius, layers):
+    """Render concentric (color, radius) circles centred on a transparent surface"""
+    size = 2 * math.ceil(radius) + 2
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    center = (size / 2, size / 2)
+    for color, layer_radius in layers:
+        pygame.draw.circle(image, color, center, layer_radius)
+    return image
+
+def orb_cluster_image(particles, detailed=True):
+    """Render particles small orbs packed in a sunflower spiral"""
+    particle_radius = GOLD_ORB_RADIUS * 0.6
+    spread = particle_radius * 1.1
+    radius = spread * math.sqrt(particles) + particle_radius
+    size = 2 * math.ceil(radius) + 2
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    for i in range(particles):
+        # Golden angle steps spread the particles evenly without a visible pattern
+        offset = pygame.Vector2(spread * math.sqrt(i + 0.5), 0).rotate(i * 137.508)
+        center = (size / 2 + offset.x, size / 2 + offset.y)
+        pygame.draw.circle(image, (255, 215, 0), center, particle_radius)
+        if detailed:
+            pygame.draw.circle(image, (255, 255, 0), center, particle_radius - 1.5)
+    return image
+
+def star_points(center, radius):
+    """Return the ten outline points of a five pointed star"""
+    points = []
+    for i in range(5):
+        angle = i * 72 - 90  # Start from top
+        outer_point = pygame.Vector2(0, -radius).rotate(angle)
+        inner_point = pygame.Vector2(0, -radius * 0.4).rotate(angle + 36)
+        points.extend([center + outer_point, center + inner_point])
+    return points
+
+def star_image(radius, debug_dot=True):
+    size = 2 * math.ceil(radius) + 4
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    center = pygame.Vector2(size / 2, size / 2)
+    points = star_points(center, radius)
+    pygame.draw.polygon(image, (255, 255, 0), points)
+    pygame.draw.polygon(image, (255, 215, 0), points, 2)
+    if debug_dot:
+        # Debug: Draw a small red dot to show star position
+        pygame.draw.circle(image, (255, 0, 0), center, 3)
+    return image
+
+def player_image(rotation):
+    # The ship's triangle, nose along rotation; its back corners reach 1.2 radii from the centre
+    size = 2 * math.ceil(PLAYER_RADIUS * 1.2) + 2
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    center = pygame.Vector2(size / 2, size / 2)
+    forward = pygame.Vector2(0, 1).rotate(rotation)
+    right = pygame.Vector2(0, 1).rotate(rotation + 90) * PLAYER_RADIUS / 1.5
+    a = center + forward * PLAYER_RADIUS
+    b = center - forward * PLAYER_RADIUS - right
+    c = center - forward * PLAYER_RADIUS + right
+    pygame.draw.polygon(image, (0, 0, 255), [a, b, c])
+    return image
+
+def sprite_blits(sprites, fallback, previous=None, alpha=1.0):
+    """Return (image, topleft) pairs for sprites with a sprite_image, adding the rest to fallback
+
+    With previous (sprite -> (x, y) before the last simulation step), sprites
+    are placed alpha of the way from there to their current position.
+    """
+    batch = []
+    for sprite in sprites:
+        sprite_image = getattr(sprite, "sprite_image", None)
+        if sprite_image is None:
+            fallback.append(sprite)
+            continue
+        image = sprite_image()
+        if image is None:
+            continue
+        half_w = image.get_width() / 2
+        half_h = image.get_height() / 2
+        position = sprite.position
+        x, y = position.x, position.y
+        if previous:
+            before = previous.get(sprite)
+            if before is not None:
+                x = before[0] + (x - before[0]) * alpha
+                y = before[1] + (y - before[1]) * alpha
+        batch.append((image, (x - half_w, y - half_h)))
+    return batch
+
+def draw_sprites(screen, sprites, previous=None, alpha=1.0):
+    """Draw sprites with a single batched blit, falling back to draw() for the rest"""
+    fallback = []
+    batch = sprite_blits(sprites, fallback, previous, alpha)
+    for sprite in fallback:
+        sprite.draw(screen)
+    if batch:
+        screen.blits(batch, doreturn=False)
+
+
+# Shared cache used by every entity draw path
+sprite_cache = SpriteCache()
@@ -1,59 +1,53 @@
-import pygame
-import random
 from constants import *
 from circleshape import CircleShape
+from spritecache import sprite_cache
+from entitystore import MOVING, FRICTION
 
 
 class Star(CircleShape):
+    motion_flags = MOVING | FRICTION
+    scheduler = None  # the world's game-time Scheduler, set in init_game
+
     def __init__(self, x, y):
         super().__init__(x, y, STAR_RADIUS)
         # Add slight random velocity
-        self.velocity = pygame.Vector2(
-            random.uniform(-30, 30),
-            random.uniform(-30, 30)
-        )
-        self.blink_timer = 0.0
+        self.set_vector('velocity', self.rng.uniform(-30, 30), self.rng.uniform(-30, 30))
+        self.blink_timer = None  # repeating visibility toggle while blinking
         self.visible = True
         self.animation_state = 'normal'  # 'normal', 'blinking'
 
-    def draw(self, screen):
+    def sprite_image(self):
         if not self.visible:
-            return
-            
-        # Draw star as a bright yellow star shape
-        points = []
-        for i in range(5):
-            angle = i * 72 - 90  # Start from top
-            outer_point = pygame.Vector2(0, -self.radius).rotate(angle)
-            inner_point = pygame.Vector2(0, -self.radius * 0.4).rotate(angle + 36)
-            points.extend([self.position + outer_point, self.position + inner_point])
-        
-        pygame.draw.polygon(screen, (255, 255, 0), points)
-        pygame.draw.polygon(screen, (255, 215, 0), points, 2)
-        
-        # Debug: Draw a small red dot to show star position
-        pygame.draw.circle(screen, (255, 0, 0), self.position, 3)
+            return None
+        # A bright yellow star shape
+        return sprite_cache.star(self.radius)
+
+    def draw(self, screen):
+        self.blit_image(screen)
 
     def update(self, dt):
-        if self.animation_state == 'blinking':
-            self.update_blink_animation(dt)
-        else:
+        if self.animation_state == 'normal' and self.slot is None:
             # Apply friction
-            self.velocity *= 0.98
+            self.velocity *= DRIFT_FRICTION ** (dt * 60)
             self.position += self.velocity * dt
 
-    def update_blink_animation(self, dt):
-        """Update blinking animation"""
-        self.blink_timer += dt
-        if self.blink_timer >= STAR_BLINK_RATE:
-            self.visible = not self.visible
-            self.blink_timer = 0.0
+    def toggle_visibility(self):
+        """Blink timer callback"""
+        self.visible = not self.visible
 
     def start_blink_animation(self):
         """Start the blinking animation"""
         self.animation_state = 'blinking'
-        self.blink_timer = 0.0
         self.visible = True
+        self.set_motion(0)  # blinking stars hold still, as update() does without a store
+        self.scheduler.cancel(self.blink_timer)
+        self.blink_timer = self.scheduler.call_every(STAR_BLINK_RATE, self.toggle_visibility)
+
+    def kill(self):
+        if self.blink_timer is not None:
+            self.scheduler.cancel(self.blink_timer)
+            self.blink_timer = None
+        super().kill()
 
     def is_collected_by(self, player):
         """Check if the star is close enough to be collected by the player"""
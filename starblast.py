@@ -0,0 +1,56 @@
+from constants import *
+from asteroid import orb_count_for
+from goldorb import GoldOrb
+
+
+class StarBlast:
+    """Star power: vaporize every asteroid and spawn its orbs a few per step
+
+    An asteroid's orbs would all start at the same spot and follow the same
+    path to the player, so each asteroid gets a single orb worth all of them.
+    orb_total and orbs_created count orb value, not orb objects.
+    """
+
+    def __init__(self, player, asteroids, orb_states, make_orb=GoldOrb):
+        self.player = player
+        self.make_orb = make_orb
+
+        # Record where each asteroid's orbs go, then remove the asteroids right away
+        exploded_asteroids = list(asteroids)
+        self.pending = [
+            (asteroid.position.x, asteroid.position.y, orb_count_for(asteroid.radius))
+            for asteroid in exploded_asteroids
+        ]
+        for asteroid in exploded_asteroids:
+            asteroid.kill()
+        self.asteroid_count = len(exploded_asteroids)
+        self.orb_total = sum(count for _, _, count in self.pending)
+        self.orbs_created = 0
+
+        # Start pull animation for every orb already in play
+        for orb in list(orb_states.normal):
+            orb.start_pull_animation(player.position)
+        # For blinking orbs, set the target but keep them blinking
+        for orb in orb_states.blinking:
+            orb.set_pull_target(player.position)
+
+    @property
+    def done(self):
+        return not self.pending
+
+    def advance(self, budget=STAR_BLAST_ORBS_PER_STEP):
+        """Spawn up to budget pending orbs (None for no limit)
+
+        The budget counts orbs rather than time so the world steps the same on every machine.
+        """
+        make_orb = self.make_orb
+        target = self.player.position
+        pending = self.pending
+        for _ in range(len(pending) if budget is None else min(budget, len(pending))):
+            x, y, count = pending.pop()
+            # One weighted orb per asteroid; it blinks into existence, then gets pulled to the player
+            orb = make_orb(x, y, count)
+            orb.start_blink_animation()
+            orb.set_pull_target(target)
+            self.orbs_created += count
+        return self.done
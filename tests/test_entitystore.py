@@ -0,0 +1,115 @@
+import random
+
+import pygame
+import pytest
+
+pytest.importorskip("numpy")
+
+from circleshape import CircleShape
+from entitystore import EntityStore, enable_store, disable_store
+from spatialgrid import SpatialGrid
+
+DT = 1 / 60
+
+
+class StoredTarget(CircleShape):
+    pass
+
+class StoredShot(CircleShape):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def stores():
+    for cls in (StoredTarget, StoredShot):
+        enable_store(cls, EntityStore(8))  # small, so the arrays have to grow
+    yield
+    for cls in (StoredTarget, StoredShot):
+        disable_store(cls)
+
+
+def make_pairs(rng, count, cls, speed=0.0):
+    """(stored, plain) shapes with the same state, the stored ones backed by cls.store"""
+    pairs = []
+    group = pygame.sprite.Group()
+    for _ in range(count):
+        x, y, radius = rng.uniform(-50, 850), rng.uniform(-50, 650), rng.uniform(2, 60)
+        velocity = (rng.uniform(-speed, speed), rng.uniform(-speed, speed))
+        age = rng.choice([0.0, DT / 2, 1.0])
+        stored, plain = cls(x, y, radius), CircleShape(x, y, radius)
+        for shape in (stored, plain):
+            group.add(shape)
+            shape.velocity = pygame.Vector2(velocity)
+            shape.age = age
+        pairs.append((stored, plain))
+    return pairs
+
+
+@pytest.mark.parametrize("dt", [0.0, DT])
+def test_cell_ranges_match_the_grid(dt):
+    pairs = make_pairs(random.Random(1), 100, StoredTarget, speed=3000)
+    grid = SpatialGrid(32)
+    for (_, plain), cells in zip(pairs, StoredTarget.store.cell_ranges(grid.cell_size, dt)):
+        bounds = plain.swept_bounds(dt) if dt else (plain.position, plain.radius)
+        assert tuple(cells) == grid.cell_range(*bounds)
+
+def test_within_matches_the_sprite_grid():
+    rng = random.Random(2)
+    pairs = make_pairs(rng, 300, StoredTarget)
+    for stored, _ in pairs[::3]:
+        stored.kill()  # moves the last rows into the freed slots
+    store_grid, sprite_grid = SpatialGrid(), SpatialGrid()
+    store_grid.rebuild_store(StoredTarget.store)
+    sprite_grid.rebuild([plain for stored, plain in pairs if stored.alive()])
+    index = {}
+    for i, (stored, plain) in enumerate(pairs):
+        index[id(stored)] = index[id(plain)] = i
+    for _ in range(50):
+        position = pygame.Vector2(rng.uniform(0, 800), rng.uniform(0, 600))
+        distance = rng.uniform(0, 200)
+        found = StoredTarget.store.within(store_grid, position, distance)
+        expected = sprite_grid.within(position, distance)
+        assert sorted(index[id(shape)] for shape in found) == sorted(index[id(shape)] for shape in expected)
+
+def test_within_by_flags_and_radii():
+    stored = [StoredTarget(100 + i * 10, 100, 4) for i in range(5)]
+    stored[2].set_motion(0)
+    grid = SpatialGrid()
+    grid.rebuild_store(StoredTarget.store)
+    centre = pygame.Vector2(100, 100)
+    assert StoredTarget.store.within(grid, centre, 20) == stored[:3]
+    assert StoredTarget.store.within(grid, centre, 20, flags=0) == [stored[2]]
+    assert StoredTarget.store.within(grid, centre, 20, include_radii=True) == stored[:3]
+    assert StoredTarget.store.within(grid, centre, 26, include_radii=True) == stored[:4]
+
+@pytest.mark.parametrize("seed", range(3))
+def test_sweeping_matches_the_sprite_grid(seed):
+    rng = random.Random(seed)
+    targets = make_pairs(rng, 200, StoredTarget, speed=300)
+    shots = make_pairs(rng, 100, StoredShot, speed=3000)
+    store_grid, sprite_grid = SpatialGrid(), SpatialGrid()
+    store_grid.rebuild_store(StoredTarget.store, DT)
+    sprite_grid.rebuild([plain for _, plain in targets], DT)
+    target_index = {}
+    for i, (stored, plain) in enumerate(targets):
+        target_index[id(stored)] = target_index[id(plain)] = i
+    shot_index = {}
+    for i, (stored, plain) in enumerate(shots):
+        shot_index[id(stored)] = shot_index[id(plain)] = i
+
+    expected = [(shot_index[id(plain)], target_index[id(other)])
+                for _, plain in shots for _, other in sprite_grid.sweeping(plain, DT)]
+    found = [(shot_index[id(shot)], target_index[id(target)])
+             for shot, target in StoredShot.store.sweeping(StoredTarget.store, DT, store_grid)]
+    assert expected  # fast shots through a crowd have to hit something
+    assert found == expected
+
+def test_sweeping_catches_tunnelling():
+    shot = StoredShot(0, 100, 2)
+    target = StoredTarget(300, 100, 10)
+    shot.velocity = (60000, 0)  # 1000 pixels in one step
+    shot.position = (1000, 100)
+    shot.age = target.age = 1.0
+    grid = SpatialGrid()
+    grid.rebuild_store(StoredTarget.store, DT)
+    assert StoredShot.store.sweeping(StoredTarget.store, DT, grid) == [(shot, target)]
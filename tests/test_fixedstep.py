@@ -0,0 +1,87 @@
+import argparse
+import random
+
+import pytest
+
+from fixedstep import FixedStepClock
+from gameworld import GameWorld
+from goldorb import GoldOrb
+from main import tick_rate_arg
+from star import Star
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_every_tick_is_stepped_merged_dropped_or_carried(seed):
+    rng = random.Random(seed)
+    clock = FixedStepClock(120, max_steps=3, max_merge=2, max_frame_time=1.0)
+    total = 0.0
+    stepped = 0.0
+    for _ in range(2000):
+        frame_time = rng.choice([1 / 60, 1 / 144, rng.uniform(0, 0.05), rng.uniform(0, 0.2)])
+        total += frame_time
+        steps = clock.advance(frame_time)
+        assert len(steps) <= 3
+        assert all(dt == pytest.approx(clock.tick) for dt in steps[:-1])
+        stepped += sum(steps)
+        assert 0.0 <= clock.alpha < 1.0
+    assert stepped == pytest.approx(clock.ticks * clock.tick)
+    assert total == pytest.approx((clock.ticks + clock.dropped_ticks) * clock.tick + clock.accumulator)
+
+def test_catch_up_merges_then_drops():
+    clock = FixedStepClock(100, max_steps=4, max_merge=3, max_frame_time=1.0)
+    steps = clock.advance(0.105)  # ten ticks and a half
+    assert steps == pytest.approx([0.01, 0.01, 0.01, 0.04])
+    assert (clock.frame_ticks, clock.frame_merged, clock.frame_dropped) == (7, 3, 3)
+    assert clock.alpha == pytest.approx(0.5)
+
+def test_long_frames_are_clipped():
+    clock = FixedStepClock(100, max_steps=100, max_merge=0, max_frame_time=0.25)
+    steps = clock.advance(2.0)
+    assert len(steps) == 25
+    assert clock.frame_dropped == 175
+
+def test_short_frames_carry_over():
+    clock = FixedStepClock(60)
+    assert clock.advance(1 / 240) == []
+    assert clock.alpha == pytest.approx(0.25)
+    assert clock.advance(1 / 240) == []
+    assert clock.advance(1 / 120) == pytest.approx([1 / 60])
+    assert clock.alpha == pytest.approx(0.0, abs=1e-9)
+
+def test_reset_forgets_leftover_time():
+    clock = FixedStepClock(60)
+    clock.advance(0.01)
+    clock.reset()
+    assert clock.alpha == 0.0
+    assert clock.advance(0.01) == []
+
+def drift_velocities(use_entity_store, steps):
+    """Velocities of a gold orb and a star after drifting through steps of the given lengths"""
+    world = GameWorld(1, use_entity_store)
+    shapes = [GoldOrb(100, 100), Star(200, 200)]
+    for shape in shapes:
+        shape.set_vector('velocity', 30, -20)
+    for dt in steps:
+        if use_entity_store:
+            world.step_stores(dt)
+        else:
+            for shape in shapes:
+                shape.update(dt)
+    return [component for shape in shapes for component in shape.velocity]
+
+@pytest.mark.parametrize("use_entity_store", [False, True])
+def test_friction_does_not_depend_on_step_length(use_entity_store):
+    if use_entity_store:
+        pytest.importorskip("numpy")
+    # One catch-up step covering four ticks at 120 Hz, four single ticks, and the same time at 60 Hz
+    merged = drift_velocities(use_entity_store, [4 / 120])
+    assert drift_velocities(use_entity_store, [1 / 120] * 4) == pytest.approx(merged)
+    assert drift_velocities(use_entity_store, [1 / 60] * 2) == pytest.approx(merged)
+    assert abs(merged[0]) < 30 and abs(merged[2]) < 30  # friction still applied
+
+@pytest.mark.parametrize("rate", [0, -60])
+def test_tick_rate_must_be_positive(rate):
+    with pytest.raises(ValueError):
+        FixedStepClock(rate)
+    with pytest.raises(argparse.ArgumentTypeError):
+        tick_rate_arg(str(rate))
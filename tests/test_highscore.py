@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+import highscore
+from highscore import HighScore
+from scorestore import ScoreStore
+
+
+@pytest.fixture(autouse=True)
+def scratch(tmp_path, monkeypatch):
+    # Keep the legacy high score file and the database out of the tree
+    monkeypatch.chdir(tmp_path)
+
+
+def wait_loaded(scores, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not scores.loaded:
+        assert time.monotonic() < deadline, "the writer never published the table"
+        time.sleep(0.01)
+        scores.refresh()
+
+
+def test_nothing_is_a_high_score_until_loaded(tmp_path, monkeypatch):
+    opened = threading.Event()
+    real_open = highscore.open_store
+
+    def slow_open(path):
+        opened.wait()
+        return real_open(path)
+
+    monkeypatch.setattr(highscore, 'open_store', slow_open)
+    scores = HighScore(path=str(tmp_path / 'scores.db'))
+    try:
+        assert not scores.loaded
+        assert not scores.is_high_score(0)
+        assert not scores.is_high_score(10 ** 9)
+        opened.set()
+        wait_loaded(scores)
+        assert scores.is_high_score(0)  # an empty table takes anything
+    finally:
+        opened.set()
+        scores.close()
+
+def test_loaded_table_sets_the_bar(tmp_path):
+    path = str(tmp_path / 'scores.db')
+    store = ScoreStore(path)
+    store.add_many([('a', 300, 1.0), ('b', 200, 2.0), ('c', 100, 3.0)])
+    store.close()
+    scores = HighScore(path=path)
+    try:
+        wait_loaded(scores)
+        assert scores.scores == [('a', 300), ('b', 200), ('c', 100)]
+        assert scores.is_high_score(101) and not scores.is_high_score(100)
+    finally:
+        scores.close()
+
+def test_close_flushes_queued_scores(tmp_path):
+    path = str(tmp_path / 'scores.db')
+    scores = HighScore(path=path)
+    for i in range(20):
+        scores.add_score(f"p{i}", i * 10)
+    scores.close()
+    assert scores.thread is None
+    scores.close()  # closing twice is harmless
+    store = ScoreStore(path)
+    try:
+        assert store.count() == 20
+        assert store.top(3) == [('p19', 190), ('p18', 180), ('p17', 170)]
+    finally:
+        store.close()
+
+def test_caller_owned_store_is_synchronous(tmp_path):
+    store = ScoreStore(str(tmp_path / 'scores.db'))
+    scores = HighScore(store)
+    assert scores.loaded and scores.thread is None
+    scores.add_score('me', 50)
+    assert store.top(1) == [('me', 50)]
+    store.close()
@@ -0,0 +1,28 @@
+import pytest
+
+from gameworld import GameWorld
+from shot import Shot
+
+DT = 1 / 60
+
+
+@pytest.fixture
+def world():
+    return GameWorld(1)
+
+
+def test_evicted_shot_is_not_retired_again(world):
+    shots = [Shot(-100, -100) for _ in range(Shot.max_count)]
+    Shot(400, 300)  # over the cap, so the oldest is evicted
+    assert not shots[0].alive()
+    # The group update pass already holding the evicted shot still updates it, offscreen
+    for shot in shots:
+        shot.update(DT)
+    stats = world.lifetime_stats()
+    assert stats['Shot.evicted'] == 1
+    assert stats['Shot.culled'] == Shot.max_count - 1
+
+def test_reasons_are_counted_per_game(world):
+    Shot(-100, -100).update(DT)
+    assert world.lifetime_stats() == {'Player.spawned': 1, 'Shot.culled': 1, 'Shot.spawned': 1}
+    assert GameWorld(2).lifetime_stats() == {'Player.spawned': 1}
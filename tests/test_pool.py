@@ -0,0 +1,107 @@
+import random
+
+import pygame
+import pytest
+
+from gameworld import GameWorld
+from goldorb import GoldOrb
+from headless import random_policy
+from pool import ObjectPool
+from shot import Shot
+from star import Star
+
+
+class Thing:
+    released = False
+
+    def on_release(self):
+        self.released = True
+
+
+def play(seed, frames=900, **options):
+    world = GameWorld(seed, **options)
+    policy = random_policy(random.Random(seed))
+    for frame in range(frames):
+        world.step(policy(world, frame), 1 / 60)
+        if world.game_over:
+            break
+    return world
+
+
+def test_released_shapes_wait_for_recycle():
+    pool = ObjectPool(4)
+    thing = Thing()
+    pool.release(thing)
+    assert thing.released
+    assert pool.acquire() is None
+    pool.recycle()
+    assert pool.acquire() is thing
+    assert pool.acquire() is None
+    assert pool.stats() == {'hits': 1, 'misses': 2, 'hit_rate': 1 / 3, 'released': 1, 'discarded': 0, 'free': 0}
+
+def test_free_list_is_capped():
+    pool = ObjectPool(2)
+    for _ in range(3):
+        pool.release(Thing())
+    pool.recycle()
+    pool.release(Thing())
+    pool.recycle()
+    stats = pool.stats()
+    assert (stats['free'], stats['released'], stats['discarded']) == (2, 4, 2)
+
+@pytest.mark.parametrize("use_entity_store", [False, True])
+def test_recycled_shot_is_reset(use_entity_store):
+    if use_entity_store:
+        pytest.importorskip("numpy")
+    world = GameWorld(1, use_entity_store)
+    shot = Shot(10, 20)
+    shot.velocity = pygame.Vector2(300, 0)
+    shot.age = 0.5
+    shot.kill()
+    # Killed this step, so not handed out again yet
+    fresh = Shot(0, 0)
+    assert fresh is not shot
+    Shot.pool.recycle()
+    again = Shot(30, 40)
+    assert again is shot
+    assert (tuple(again.position), tuple(again.velocity), again.age) == ((30, 40), (0, 0), 0.0)
+    assert set(again.groups()) == set(Shot.containers) and again in world.shots
+
+@pytest.mark.parametrize("use_entity_store", [False, True])
+def test_recycled_star_and_orb_are_reset(use_entity_store):
+    if use_entity_store:
+        pytest.importorskip("numpy")
+    world = GameWorld(1, use_entity_store)
+    star = Star(100, 100)
+    star.start_blink_animation()
+    orb = GoldOrb(100, 100, value=5)
+    orb.start_pull_animation(world.player.position)
+    star.kill()
+    orb.kill()
+    Star.pool.recycle()
+    GoldOrb.pool.recycle()
+
+    assert Star(50, 60) is star
+    assert (star.animation_state, star.visible, star.blink_timer) == ('normal', True, None)
+    assert star.velocity.length() > 0
+    star.update(1.0)
+    if use_entity_store:
+        world.step_stores(1.0)
+    assert tuple(star.position) != (50, 60)  # drifts again
+
+    assert GoldOrb(70, 80) is orb
+    assert (orb.animation_state, orb.visible, orb.value, orb.target_position) == ('normal', True, 1, None)
+    assert tuple(orb.original_position) == (70, 80)
+
+@pytest.mark.parametrize("seed", [2, 6])
+def test_pools_do_not_change_the_game(seed):
+    pooled = play(seed)
+    checksum, stats = pooled.checksum(), pooled.pool_stats()
+    assert stats['Shot']['hits'] > 0
+    unpooled = play(seed, use_pools=False)
+    assert unpooled.checksum() == checksum
+    assert unpooled.pool_stats() == {}
+
+def test_pools_do_not_change_the_store_game():
+    pytest.importorskip("numpy")
+    assert play(6, use_entity_store=True).checksum() == play(6, use_entity_store=True, use_pools=False).checksum()
@@ -0,0 +1,87 @@
+import argparse
+import random
+
+import pytest
+
+from gameworld import GameWorld
+from headless import random_policy
+from main import seed_arg
+from recording import Recorder, load_recording, replay
+from utility_commands import UtilityCommands
+
+
+def record_game(path, seed, frames=900, keys=None, use_entity_store=False):
+    """Play a seeded game with random inputs, recording it the way main() does; returns the live world"""
+    world = GameWorld(seed, use_entity_store)
+    utility = UtilityCommands(world.game_objects())
+    policy = random_policy(random.Random(seed))
+    recorder = Recorder(path, world.seed)
+    for frame in range(frames):
+        frame_keys = (keys or {}).get(frame, [])
+        for key in frame_keys:
+            utility.handle_key_press(key)
+        inputs = policy(world, frame)
+        world.step(inputs, 1 / 60)
+        recorder.record(inputs, 1 / 60, frame_keys)
+        if world.game_over:
+            break
+    recorder.close(world.checksum())
+    return world
+
+
+@pytest.mark.parametrize("seed", [1, 42, 2 ** 64 - 1])
+def test_replay_matches_recorded_checksum(tmp_path, seed):
+    path = tmp_path / 'game.rec'
+    live = record_game(path, seed)
+    result = replay(path)
+    assert result['matches'] is True
+    assert result['checksum'] == live.checksum()
+    assert (result['frames'], result['score']) == (live.frame, live.player.points)
+
+def test_replay_with_utility_keys(tmp_path):
+    import pygame
+    path = tmp_path / 'game.rec'
+    # Turn utility mode on, then spawn stars and orbs, add points and set off a star blast
+    keys = {0: [pygame.K_t], 20: [pygame.K_g, pygame.K_1], 60: [pygame.K_e], 90: [pygame.K_p, pygame.K_g]}
+    live = record_game(path, 2, keys=keys)
+    result = replay(path)
+    assert result['matches'] is True and result['checksum'] == live.checksum()
+
+def test_store_replay_matches_sprite_recording(tmp_path):
+    pytest.importorskip("numpy")
+    path = tmp_path / 'game.rec'
+    record_game(path, 3)
+    assert replay(path, use_entity_store=True)['matches'] is True
+
+def test_checksum_follows_the_world(tmp_path):
+    path = tmp_path / 'game.rec'
+    live = record_game(path, 5, frames=200)
+    before = live.checksum()
+    live.player.position.x += 1
+    assert live.checksum() != before
+
+def test_recording_round_trips(tmp_path):
+    path = tmp_path / 'game.rec'
+    live = record_game(path, 11, frames=50)
+    seed, checksum, frames = load_recording(path)
+    assert (seed, checksum, len(frames)) == (11, live.checksum(), live.frame)
+    assert all(dt == 1 / 60 for _, dt, _ in frames)
+
+def test_recording_without_checksum(tmp_path):
+    path = tmp_path / 'game.rec'
+    Recorder(path, 9).close()
+    assert replay(path)['matches'] is None
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'not.rec'
+    path.write_bytes(b"hello")
+    with pytest.raises(ValueError):
+        load_recording(path)
+
+@pytest.mark.parametrize("text", ["-1", str(2 ** 64)])
+def test_seed_must_fit_the_header(text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        seed_arg(text)
+
+def test_seed_arg_accepts_the_full_range():
+    assert seed_arg("0") == 0 and seed_arg(str(2 ** 64 - 1)) == 2 ** 64 - 1
@@ -0,0 +1,130 @@
+import heapq
+import itertools
+import random
+
+import pytest
+
+from scheduler import Scheduler
+
+
+class ReferenceTimer:
+    def __init__(self, callback, args, interval):
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+
+
+class SortedQueue:
+    """Reference scheduler: every timer in one heap ordered by (when, scheduling order)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.heap = []
+        self.sequence = itertools.count()
+
+    def call_at(self, when, callback, *args):
+        timer = ReferenceTimer(callback, args, None)
+        heapq.heappush(self.heap, (when, next(self.sequence), timer))
+        return timer
+
+    def call_every(self, interval, callback, *args, first=None):
+        timer = ReferenceTimer(callback, args, interval)
+        heapq.heappush(self.heap, (self.now + (interval if first is None else first), next(self.sequence), timer))
+        return timer
+
+    def cancel(self, timer):
+        timer.cancelled = True
+
+    def advance(self, dt):
+        self.now += dt
+        while self.heap and self.heap[0][0] <= self.now:
+            when, _, timer = heapq.heappop(self.heap)
+            if timer.cancelled:
+                continue
+            if timer.interval is not None:
+                heapq.heappush(self.heap, (when + timer.interval, next(self.sequence), timer))
+            timer.callback(*timer.args)
+
+
+def run_script(scheduler, seed, steps=600, reschedule=False):
+    """Drive a scheduler with a random mix of timers, cancels and advances, returning what fired when"""
+    rng = random.Random(seed)
+    fired = []
+    handles = []
+    labels = itertools.count()
+
+    def fire(label):
+        fired.append((label, scheduler.now))
+        if reschedule and rng.random() < 0.3:
+            # Callbacks schedule more work, some of it already due
+            scheduler.call_at(scheduler.now + rng.choice([-0.01, 0.0, 0.02, 1.0]), fire, next(labels))
+
+    for _ in range(steps):
+        action = rng.random()
+        if action < 0.35:
+            delay = rng.choice([0.0, rng.uniform(-0.05, 0.2), rng.uniform(0, 5), rng.uniform(0, 200)])
+            handles.append(scheduler.call_at(scheduler.now + delay, fire, next(labels)))
+        elif action < 0.45:
+            interval = rng.choice([0.02, rng.uniform(0.05, 1.0), rng.uniform(1, 30)])
+            handles.append(scheduler.call_every(interval, fire, next(labels), first=rng.choice([None, 0.0, 0.5])))
+        elif action < 0.55 and handles:
+            scheduler.cancel(handles.pop(rng.randrange(len(handles))))
+        else:
+            scheduler.advance(rng.choice([0.0, 1 / 60, rng.uniform(0, 0.1), rng.uniform(0, 3)]))
+    return fired
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_sorted_queue(seed):
+    assert run_script(Scheduler(), seed) == run_script(SortedQueue(), seed)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_sorted_queue_when_callbacks_schedule(seed):
+    assert run_script(Scheduler(), seed, reschedule=True) == run_script(SortedQueue(), seed, reschedule=True)
+
+@pytest.mark.parametrize("slots,levels", [(4, 1), (4, 2), (8, 3)])
+def test_small_wheels_match_sorted_queue(slots, levels):
+    # Most timers land in higher levels or the overflow list and have to cascade down
+    assert run_script(Scheduler(0.01, slots, levels), 7) == run_script(SortedQueue(), 7)
+
+def test_repeating_timer_catches_up_in_order():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.call_every(0.1, lambda: fired.append('tick'))
+    scheduler.call_at(0.25, lambda: fired.append('once'))
+    scheduler.advance(0.45)
+    assert fired == ['tick', 'tick', 'once', 'tick', 'tick']
+
+def test_cancel_and_pending():
+    scheduler = Scheduler()
+    fired = []
+    keep = scheduler.call_later(1.0, fired.append, 'keep')
+    drop = scheduler.call_later(1.0, fired.append, 'drop')
+    repeat = scheduler.call_every(0.5, fired.append, 'repeat')
+    assert len(scheduler) == 3
+    scheduler.cancel(drop)
+    scheduler.cancel(drop)  # cancelling twice is harmless
+    assert len(scheduler) == 2
+    scheduler.advance(1.0)
+    assert fired == ['repeat', 'keep', 'repeat']
+    assert keep.cancelled and len(scheduler) == 1
+    scheduler.cancel(repeat)
+    scheduler.advance(5.0)
+    assert fired == ['repeat', 'keep', 'repeat'] and len(scheduler) == 0
+
+def test_set_interval_counts_from_last_call():
+    scheduler = Scheduler()
+    fired = []
+    timer = scheduler.call_every(1.0, lambda: fired.append(scheduler.now))
+    scheduler.advance(1.0)
+    scheduler.advance(0.25)
+    timer = scheduler.set_interval(timer, 0.5)
+    scheduler.advance(0.25)
+    scheduler.advance(0.5)
+    assert fired == pytest.approx([1.0, 1.5, 2.0])
+    assert len(scheduler) == 1
+
+def test_slots_must_be_a_power_of_two():
+    with pytest.raises(ValueError):
+        Scheduler(slots=100)
@@ -0,0 +1,120 @@
+import random
+
+import pygame
+import pytest
+
+from circleshape import CircleShape, sweep_fraction
+from spatialgrid import SpatialGrid
+
+DT = 1 / 60
+
+
+def make_shapes(rng, count, speed=0.0, group=None):
+    """Live CircleShapes scattered over (and a little past) the screen"""
+    group = group if group is not None else pygame.sprite.Group()
+    shapes = []
+    for _ in range(count):
+        shape = CircleShape(rng.uniform(-50, 850), rng.uniform(-50, 650), rng.uniform(2, 60))
+        shape.velocity = pygame.Vector2(rng.uniform(-speed, speed), rng.uniform(-speed, speed))
+        shape.age = rng.choice([0.0, DT / 2, 1.0])
+        group.add(shape)
+        shapes.append(shape)
+    return shapes
+
+def brute_force_sweep(shape, other, dt):
+    own_time, other_time = min(dt, shape.age), min(dt, other.age)
+    move = shape.velocity * own_time - other.velocity * other_time
+    start = shape.position - other.position - move
+    return sweep_fraction(start.x, start.y, move.x, move.y, shape.radius + other.radius)
+
+
+@pytest.mark.parametrize("cell_size", [16, 64, 250])
+def test_colliding_matches_brute_force(cell_size):
+    rng = random.Random(cell_size)
+    shapes = make_shapes(rng, 300)
+    grid = SpatialGrid(cell_size)
+    grid.rebuild(shapes)
+    for shape in make_shapes(rng, 50):
+        expected = {id(other) for other in shapes if other.collides_with(shape)}
+        assert {id(other) for other in grid.colliding(shape)} == expected
+
+def test_within_matches_brute_force():
+    rng = random.Random(1)
+    shapes = make_shapes(rng, 300)
+    grid = SpatialGrid()
+    grid.rebuild(shapes)
+    for _ in range(50):
+        position = pygame.Vector2(rng.uniform(0, 800), rng.uniform(0, 600))
+        distance = rng.uniform(0, 200)
+        expected = {id(other) for other in shapes if other.position.distance_to(position) <= distance}
+        assert {id(other) for other in grid.within(position, distance)} == expected
+
+def test_query_returns_each_shape_once():
+    grid = SpatialGrid(10)
+    group = pygame.sprite.Group()
+    big = CircleShape(50, 50, 45)
+    group.add(big)
+    grid.insert(big)
+    assert grid.query(pygame.Vector2(50, 50), 45) == [big]
+
+def test_dead_shapes_are_skipped():
+    rng = random.Random(2)
+    shapes = make_shapes(rng, 50)
+    grid = SpatialGrid()
+    grid.rebuild(shapes)
+    for shape in shapes[::2]:
+        shape.kill()
+    for shape in shapes:
+        assert all(other.alive() for other in grid.colliding(shape))
+        assert all(other.alive() for other in grid.within(shape.position, 100))
+
+def test_sweeping_matches_brute_force():
+    rng = random.Random(3)
+    targets = make_shapes(rng, 200, speed=300)
+    shots = make_shapes(rng, 100, speed=3000)
+    grid = SpatialGrid()
+    grid.rebuild(targets, DT)
+    for shot in shots:
+        expected = sorted((t, id(other)) for other in targets
+                          for t in [brute_force_sweep(shot, other, DT)] if t is not None)
+        hits = grid.sweeping(shot, DT)
+        assert sorted((t, id(other)) for t, other in hits) == pytest.approx(expected)
+        assert [t for t, _ in hits] == sorted(t for t, _ in hits)
+
+def test_fast_shot_cannot_tunnel_through_a_target():
+    group = pygame.sprite.Group()
+    target = CircleShape(400, 300, 10)
+    shot = CircleShape(430, 300, 2)
+    group.add(target, shot)
+    # The shot started 1000 px to the left and flew straight through the target during the step
+    shot.velocity = pygame.Vector2(1030 / DT, 0)
+    shot.age = 1.0
+    assert not shot.collides_with(target)
+
+    grid = SpatialGrid()
+    grid.rebuild([target], DT)
+    [(t, hit)] = grid.sweeping(shot, DT)
+    assert hit is target
+    assert 0.0 < t < 1.0
+
+def test_shape_spawned_this_step_has_not_moved():
+    group = pygame.sprite.Group()
+    target = CircleShape(400, 300, 10)
+    shot = CircleShape(430, 300, 2)
+    group.add(target, shot)
+    shot.velocity = pygame.Vector2(1030 / DT, 0)
+    shot.age = 0.0
+    grid = SpatialGrid()
+    grid.rebuild([target], DT)
+    assert grid.sweeping(shot, DT) == []
+
+def test_sweep_fraction():
+    # Already touching
+    assert sweep_fraction(1, 0, 5, 0, 2) == 0.0
+    # Closing head on from 10 away with contact at distance 2, moving 16 in the step
+    assert sweep_fraction(-10, 0, 16, 0, 2) == pytest.approx(0.5)
+    # Moving apart, standing still, passing wide and stopping short
+    assert sweep_fraction(-10, 0, -5, 0, 2) is None
+    assert sweep_fraction(-10, 0, 0, 0, 2) is None
+    assert sweep_fraction(-10, 5, 20, 0, 2) is None
+    assert sweep_fraction(-10, 0, 5, 0, 2) is None
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+import pygame
+from constants import *
+
+
+class TextRenderer:
+    """Caches fonts by (name, size) and rendered text surfaces in a bounded LRU"""
+
+    def __init__(self, max_bytes=TEXT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size, name=None):
+        """Return a SysFont, creating it only the first time it is asked for"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.SysFont(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, name=None):
+        """Return a rendered surface for text, reusing a cached one if possible"""
+        key = (text, size, tuple(color), name)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size, name).render(text, True, color)
+        self.surfaces[key] = surface
+        self.cached_bytes += self.surface_bytes(surface)
+
+        # Evict least recently used surfaces until we are back under budget
+        while self.cached_bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.cached_bytes -= self.surface_bytes(evicted)
+        return surface
+
+    def draw(self, screen, text, size, color, **rect_kwargs):
+        """Render text and blit it positioned by a Rect keyword, e.g. center=(x, y)"""
+        surface = self.render(text, size, color)
+        rect = surface.get_rect(**rect_kwargs)
+        screen.blit(surface, rect)
+        return rect
+
+    def clear(self):
+        """Drop every cached surface (fonts are kept)"""
+        self.surfaces.clear()
+        self.cached_bytes = 0
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+# Shared renderer used by every text draw in the game
+text_renderer = TextRenderer()
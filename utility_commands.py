@@ -1,16 +1,17 @@
 import pygame
-import random
 from constants import *
 from star import Star
 from goldorb import GoldOrb
 from meteorite import Meteorite
+from asteroid import Asteroid
+from gamelog import log
 
 
 class UtilityCommands:
     def __init__(self, game_objects):
         """
         Initialize utility commands with references to game objects
-        game_objects should be a dict containing: player, asteroids, orbs, meteorites, stars, updatable, drawable
+        game_objects should be a dict containing: player, asteroids, orbs, meteorites, stars, updatable, drawable, world
         """
         self.game_objects = game_objects
         self.enabled = False  # Toggle utility commands on/off (default: disabled)
@@ -63,42 +64,13 @@ class UtilityCommands:
             
     def trigger_star_effect(self):
         """E key - Trigger star explosion effect at player position"""
-        print("UTILITY: Triggering star effect")
-        player = self.game_objects['player']
-        
-        # Create a temporary star at player position
-        temp_star = Star(player.position.x, player.position.y)
-        
-        # Vaporize all asteroids and collect their orbs
-        exploded_asteroids = list(self.game_objects['asteroids'])
-        total_orbs_created = 0
-        
-        for asteroid in exploded_asteroids:
-            # Use the new method that drops orbs based on asteroid size
-            new_orbs = asteroid.destroy_for_orbs()
-            total_orbs_created += len(new_orbs)
-            if new_orbs:
-                for orb in new_orbs:
-                    # Start the orb with blink animation
-                    orb.start_blink_animation()
-                    self.game_objects['orbs'].add(orb)
-                    self.game_objects['updatable'].add(orb)
-                    self.game_objects['drawable'].add(orb)
-        
-        # Start pull animation for ALL orbs (both existing and newly created)
-        all_orbs = list(self.game_objects['orbs'])
-        for orb in all_orbs:
-            if orb.animation_state == 'normal':
-                orb.start_pull_animation(player.position)
-            elif orb.animation_state == 'blinking':
-                # For blinking orbs, set the target but keep them blinking
-                orb.set_pull_target(player.position)
-            
-        print(f"UTILITY: Destroyed {len(exploded_asteroids)} asteroids, created {total_orbs_created} orbs")
+        log.info("UTILITY: Triggering star effect")
+        blast = self.game_objects['world'].start_star_blast()
+        log.info("UTILITY: Destroyed %d asteroids, creating %d orbs", blast.asteroid_count, blast.orb_total)
         
     def spawn_gold_orb(self):
         """G key or 1 key - Spawn a gold orb at player position"""
-        print("UTILITY: Spawning gold orb")
+        log.info("UTILITY: Spawning gold orb")
         player = self.game_objects['player']
         orb = GoldOrb(player.position.x, player.position.y)
         self.game_objects['orbs'].add(orb)
@@ -107,13 +79,12 @@ class UtilityCommands:
         
     def spawn_blinking_star(self):
         """G key - Spawn a blinking star at a random position on the screen"""
-        print("UTILITY: Spawning blinking star")
-        screen_width = pygame.display.get_surface().get_width()
-        screen_height = pygame.display.get_surface().get_height()
+        log.info("UTILITY: Spawning blinking star")
+        rng = self.game_objects['world'].rng
         
         # Generate a random position within the screen bounds
-        x = random.randint(0, screen_width - 1)
-        y = random.randint(0, screen_height - 1)
+        x = rng.randint(0, SCREEN_WIDTH - 1)
+        y = rng.randint(0, SCREEN_HEIGHT - 1)
         
         # Create a star at the random position
         blinking_star = Star(x, y)
@@ -122,11 +93,11 @@ class UtilityCommands:
         self.game_objects['stars'].add(blinking_star)
         self.game_objects['updatable'].add(blinking_star)
         self.game_objects['drawable'].add(blinking_star)
-        print(f"UTILITY: Blinking star spawned at ({x}, {y})")
+        log.info("UTILITY: Blinking star spawned at (%d, %d)", x, y)
         
     def spawn_meteorite(self):
         """M key or 2 key - Spawn a meteorite at player position"""
-        print("UTILITY: Spawning meteorite")
+        log.info("UTILITY: Spawning meteorite")
         player = self.game_objects['player']
         meteorite = Meteorite(player.position.x, player.position.y)
         self.game_objects['meteorites'].add(meteorite)
@@ -135,9 +106,8 @@ class UtilityCommands:
         
     def spawn_asteroid(self):
         """A key or 4 key - Spawn an asteroid at player position"""
-        print("UTILITY: Spawning asteroid")
+        log.info("UTILITY: Spawning asteroid")
         player = self.game_objects['player']
-        from asteroid import Asteroid
         asteroid = Asteroid(player.position.x, player.position.y, ASTEROID_MIN_RADIUS * 2)
         self.game_objects['asteroids'].add(asteroid)
         self.game_objects['updatable'].add(asteroid)
@@ -145,25 +115,25 @@ class UtilityCommands:
         
     def add_points(self):
         """P key or 5 key - Add 1000 points to player"""
-        print("UTILITY: Adding 1000 points")
+        log.info("UTILITY: Adding 1000 points")
         player = self.game_objects['player']
         player.points += 1000
-        print(f"UTILITY: Player score is now {player.points}")
+        log.info("UTILITY: Player score is now %d", player.points)
         
     def clear_screen(self):
         """C key or 6 key - Clear all game objects except player"""
-        print("UTILITY: Clearing screen")
+        log.info("UTILITY: Clearing screen")
         self.game_objects['asteroids'].empty()
         self.game_objects['orbs'].empty()
         self.game_objects['meteorites'].empty()
         self.game_objects['stars'].empty()
-        print("UTILITY: Screen cleared")
+        log.info("UTILITY: Screen cleared")
         
     def toggle_utility(self):
         """T key - Toggle utility commands on/off"""
         self.enabled = not self.enabled
         status = "ENABLED" if self.enabled else "DISABLED"
-        print(f"UTILITY: Commands {status}")
+        log.info("UTILITY: Commands %s", status)
         
     def print_help(self):
         """Print available utility commands"""